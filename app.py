@@ -1,6 +1,31 @@
+import os
+import threading
+import time
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
+
+from checkpoints import Checkpoints
+from cohorts import IN_TRAINING, OFFER_PENDING, READY_COHORTS, assign_cohorts, cohort_frame, kpis
+from features import candidate_features, job_features, job_labels
+from fetch import SheetFetcher
+from history import History
+from ingest import SALARY_PARTS
+from instrument import Run, cache_counts, log_to_stderr, mark, stage, track_cache
+from pipeline import label_matches, load_jobs, load_roster, match_candidates, read_artifact
+from refresher import Refresher
+from result_cache import ResultCache
+from score_store import ScoreStore
+from scoring import MAX_POINTS, match_pairs, top_candidates_from_subscores, top_k_from_subscores
+from search import build_indexes
+from snapshot import format_age, load_snapshot, save_snapshot, touch_snapshot
+
+# Every stage below (fetch, parse, clean, kpis, score, render) and the time to
+# the first metric card are recorded into this run, shown in the Diagnostics
+# panel and logged as JSON lines
+log_to_stderr()
+run = Run().start()
 
 # ---- PAGE CONFIG (must come FIRST) ----
 st.set_page_config(
@@ -9,389 +34,513 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# ---- SIMPLE DARK THEME ----
-st.markdown("""
-<style>
-/* Simple Dark Theme */
-html, body, [data-testid="stAppViewContainer"] {
-    background-color: #1e1e1e !important;
-    color: #ffffff !important;
-}
-
-/* Headers */
-h1, h2, h3 {
-    color: #ffffff !important;
-    font-weight: 600 !important;
-}
-
-/* Metrics Cards */
-[data-testid="stMetric"] {
-    background-color: #2d2d2d !important;
-    border: 1px solid #444 !important;
-    border-radius: 8px !important;
-    padding: 16px !important;
-}
-
-[data-testid="stMetricValue"] {
-    color: #4CAF50 !important;
-    font-size: 2rem !important;
-    font-weight: 600 !important;
-}
-
-[data-testid="stMetricLabel"] {
-    color: #cccccc !important;
-    font-size: 0.9rem !important;
-}
-
-/* Tables */
-table, th, td {
-    background-color: #2d2d2d !important;
-    color: #ffffff !important;
-}
-
-th {
-    background-color: #444 !important;
-    color: #ffffff !important;
-    font-weight: 600 !important;
-}
-
-/* Charts */
-.js-plotly-plot, .plot-container {
-    background-color: transparent !important;
-}
-
-/* Expanders */
-[data-testid="stExpander"] {
-    background-color: #2d2d2d !important;
-    border: 1px solid #444 !important;
-    border-radius: 6px !important;
-}
-
-[data-testid="stExpander"] summary {
-    background-color: #444 !important;
-    color: #ffffff !important;
-}
-
-/* Success Messages */
-.stSuccess {
-    background-color: #2d4a2d !important;
-    border: 1px solid #4CAF50 !important;
-    color: #ffffff !important;
-}
-
-/* App background */
-.stApp {
-    background-color: #1e1e1e !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# ---- THEME ----
+# One merged stylesheet, read once per server process
+STYLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.css")
+
+
+@st.cache_resource
+def page_style():
+    with open(STYLE_PATH, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+
+st.markdown(page_style(), unsafe_allow_html=True)
 
 # --- Header ---
 st.markdown("<h1>🎓 MIT Candidate Training Dashboard</h1>", unsafe_allow_html=True)
-# ---- PAGE CONFIG ----
-
- 
-
-
-# ---- CUSTOM STYLING ----
-st.markdown("""
-    <style>
-        :root {
-            color-scheme: dark;
-        }
-        body, .stApp {
-            background-color: #0b0e14 !important;
-            color: #f5f5f5 !important;
-        }
-        h1, h2, h3, h4, h5, h6, p, span, div {
-            color: #f5f5f5 !important;
-        }
-        div[data-testid="stMetricValue"] {
-            font-size: 2rem !important;
-            font-weight: 700 !important;
-        }
-        div[data-testid="stMetricLabel"] {
-            font-size: 1rem !important;
-            color: #bbbbbb !important;
-        }
-        .stMetric {
-            background: #15181e !important;
-            border-radius: 16px !important;
-            padding: 24px !important;
-            box-shadow: 0 0 15px rgba(108, 99, 255, 0.15);
-            text-align: center;
-        }
-        .data-source {
-            background-color: #143d33;
-            padding: 12px 18px;
-            border-radius: 10px;
-            font-weight: 500;
-            color: #e1e1e1;
-            box-shadow: 0 0 10px rgba(0,0,0,0.3);
-        }
-        [data-testid="stDataFrame"] {
-            border-radius: 12px !important;
-            overflow: hidden !important;
-            box-shadow: 0 0 10px rgba(108, 99, 255, 0.15);
-        }
-        table {
-            background-color: #14171c !important;
-            border-collapse: collapse !important;
-            width: 100%;
-        }
-        th {
-            background-color: #1f2430 !important;
-            color: #e1e1e1 !important;
-            font-weight: 600 !important;
-            text-transform: uppercase;
-        }
-        td {
-            background-color: #171a21 !important;
-            color: #d7d7d7 !important;
-            font-size: 0.95rem !important;
-            border-top: 1px solid #252a34 !important;
-        }
-        tr:hover td {
-            background-color: #1e2230 !important;
-        }
-        .pending-title {
-            font-size: 1.8rem !important;
-            font-weight: 700 !important;
-            color: #ffd95e !important;
-            margin-bottom: 8px !important;
-        }
-        .placeholder-box {
-            background: #1E1E1E;
-            border-radius: 12px;
-            padding: 80px;
-            text-align: center;
-            font-size: 1.2rem;
-            color: #bbb;
-            box-shadow: 0 0 10px rgba(108, 99, 255, 0.1);
-        }
-        .main-card {
-            border: 1px solid rgba(108, 99, 255, 0.15);
-            border-radius: 16px;
-        }
-    </style>
-""", unsafe_allow_html=True)
+
+
+# ---- DATA SOURCES ----
+# Either URL can be pointed at a local stand-in (e.g. a CSV fixture server)
+ROSTER_URL = os.environ.get(
+    "ROSTER_CSV_URL",
+    "https://docs.google.com/spreadsheets/d/e/"
+    "2PACX-1vTAdbdhuieyA-axzb4aLe8c7zdAYXBLPNrIxKRder6j1ZAlj2g4U1k0YzkZbm_dEcSwBik4CJ57FROJ/"
+    "pub?gid=813046237&single=true&output=csv",
+)
+# ✅ Updated Placement Options Google Sheets URL
+JOBS_URL = os.environ.get(
+    "JOBS_CSV_URL",
+    "https://docs.google.com/spreadsheets/d/e/"
+    "2PACX-1vTAdbdhuieyA-axzb4aLe8c7zdAYXBLPNrIxKRder6j1ZAlj2g4U1k0YzkZbm_dEcSwBik4CJ57FROJ/"
+    "pub?gid=1073524035&single=true&output=csv",
+)
+ROSTER_TTL = int(os.environ.get("ROSTER_TTL_SECONDS", 60))
+JOBS_TTL = int(os.environ.get("JOBS_TTL_SECONDS", 300))
+# Each sheet is reloaded in the background this many seconds before its TTL
+# runs out; delays are shortened by up to REFRESH_JITTER (a fraction), and
+# failures are retried after REFRESH_BACKOFF seconds, doubling up to the max
+REFRESH_LEAD = float(os.environ.get("DASHBOARD_REFRESH_LEAD", 10))
+REFRESH_JITTER = float(os.environ.get("DASHBOARD_REFRESH_JITTER", 0.1))
+REFRESH_BACKOFF = float(os.environ.get("DASHBOARD_REFRESH_BACKOFF", 5))
+REFRESH_MAX_BACKOFF = float(os.environ.get("DASHBOARD_REFRESH_MAX_BACKOFF", 300))
+FIRST_LOAD_TIMEOUT = 45
+# Directory written by `python pipeline.py`; when set, nothing is fetched or scored here
+ARTIFACT_DIR = os.environ.get("DASHBOARD_ARTIFACT")
+# Derived results (tables, KPIs, top matches) kept for all sessions of the process
+RESULT_CACHE_ENTRIES = int(os.environ.get("DASHBOARD_RESULT_CACHE_ENTRIES", 64))
+
+
+@st.cache_resource
+def get_fetcher():
+    # Shared connection pool and ETag/hash state for the whole server process
+    return SheetFetcher()
+
+
+@st.cache_resource
+def get_checkpoints():
+    # Last cleaned frame per sheet, keyed on its bytes (and the date, for Week)
+    return Checkpoints()
+
+
+def fetch_roster(fetcher, checkpoints):
+    # Runs on the refresher, which times it as the "refresh-roster" run
+    previous = checkpoints.latest("roster")
+    df = load_roster(ROSTER_URL, fetcher, checkpoints=checkpoints)
+    if df is not previous:
+        save_snapshot("roster", df)
+    else:  # already in the snapshot, which is now this recent
+        touch_snapshot("roster")
+    return df
+
+
+def fetch_jobs(fetcher, checkpoints):
+    previous = checkpoints.latest("jobs")
+    jobs_df = load_jobs(JOBS_URL, fetcher, checkpoints=checkpoints)
+    if jobs_df is not previous:
+        save_snapshot("jobs", jobs_df)
+    else:
+        touch_snapshot("jobs")
+    return jobs_df
+
+
+def sheet_version(name, frame, source, as_of):
+    """Content key of a refreshed sheet's frame, else where and when it was loaded."""
+    key = get_checkpoints().key_of(name, frame)
+    return (source, as_of) if key is None else key
+
 
 # ---- LOAD DATA ----
-@st.cache_data(ttl=60)
+# Viewers never fetch: both sheets are reloaded and rescored on background
+# threads shortly before their TTL, and each run reads the latest result.
+@st.cache_resource
+def get_refreshers():
+    """One started refresher per sheet for the whole server process."""
+    fetcher, score_store, history = get_fetcher(), get_score_store(), get_history()
+    checkpoints = get_checkpoints()
+    options = dict(jitter=REFRESH_JITTER, backoff=REFRESH_BACKOFF, max_backoff=REFRESH_MAX_BACKOFF)
+    refreshers = {
+        "roster": Refresher(
+            "roster", lambda: fetch_roster(fetcher, checkpoints), ROSTER_TTL - REFRESH_LEAD, **options
+        ),
+        "jobs": Refresher("jobs", lambda: fetch_jobs(fetcher, checkpoints), JOBS_TTL - REFRESH_LEAD, **options),
+    }
+
+    recorded = {}
+    # Both refreshers run the hook; one at a time, so a version is recorded
+    # once and the later hook always sees both sheets' newest frames
+    recording = threading.Lock()
+
+    def after_refresh(_):
+        with recording:
+            roster, jobs = refreshers["roster"].latest(), refreshers["jobs"].latest()
+            if roster is None or jobs is None or roster.value is None or jobs.value is None:
+                return
+            # Nothing to record or rescore when both frames are the checkpointed ones seen last time
+            version = (checkpoints.key_of("roster", roster.value), checkpoints.key_of("jobs", jobs.value))
+            if None not in version and recorded.get("version") == version:
+                return
+            recorded["version"] = version
+            cohort = assign_cohorts(roster.value)
+            # Append what changed to the history, then bring the score store up
+            # to date so the next viewer's update is a no-op; the store keeps
+            # this update's counters for the version, which viewers then show
+            history.record(roster.value, cohort, jobs.value, kpis(cohort, jobs.value))
+            candidates_df = match_candidates(roster.value, cohort)
+            if len(candidates_df) and len(jobs.value):
+                score_store.update(
+                    candidate_features(candidates_df), job_features(jobs.value),
+                    version=None if None in version else version,
+                )
+
+    for refresher in refreshers.values():
+        refresher.on_refresh = after_refresh
+        refresher.start()
+    return refreshers
+
+
+def latest_frame(name):
+    """``(frame, source, as_of, error)`` for one sheet.
+
+    ``source`` is "Google Sheets" for the refresher's last good load,
+    "Snapshot" before the first one (or while it keeps failing), or "Error"
+    with an empty frame.  ``as_of`` is when the frame was loaded or saved;
+    ``error`` is the latest refresh failure, if any.
+    """
+    refresher = get_refreshers()[name]
+    refreshed = refresher.latest()
+    if refreshed is None or refreshed.value is None:
+        snapshot = load_snapshot(name)
+        if snapshot is not None:
+            return snapshot.df, "Snapshot", snapshot.saved_at, refreshed and refreshed.error
+        refreshed = refresher.wait(FIRST_LOAD_TIMEOUT)
+    if refreshed is None:
+        return pd.DataFrame(), "Error", None, TimeoutError(f"no data after {FIRST_LOAD_TIMEOUT}s")
+    if refreshed.value is None:
+        return pd.DataFrame(), "Error", None, refreshed.error
+    return refreshed.value, "Google Sheets", refreshed.loaded_at, refreshed.error
+
+
 def load_data():
-    main_data_url = (
-        "https://docs.google.com/spreadsheets/d/e/"
-        "2PACX-1vTAdbdhuieyA-axzb4aLe8c7zdAYXBLPNrIxKRder6j1ZAlj2g4U1k0YzkZbm_dEcSwBik4CJ57FROJ/"
-        "pub?gid=813046237&single=true&output=csv"
-    )
-    try:
-        df = pd.read_csv(main_data_url, skiprows=1)  # Skip header row
-        data_source = "Google Sheets"
-    except Exception as e:
-        st.error(f"⚠️ Google Sheets error: {e}")
-        return pd.DataFrame(), "Error"
-
-    df = df.dropna(how="all")
-    df.columns = [c.strip() if isinstance(c, str) else c for c in df.columns]
-    df = df.rename(columns={"Week ": "Week", "Start date": "Start Date"})
-    
-    # Handle new data structure - filter out empty rows and clean data
-    df = df[df["MIT Name"].notna() & (df["MIT Name"] != "")]  # Remove rows without names
-    
-    
-    
-    if "Start Date" in df.columns:
-        df["Start Date"] = pd.to_datetime(df["Start Date"], errors="coerce")
-
-    today = pd.Timestamp.now()
-
-    # Only calculate weeks if Week column is empty or has manual values
-    # Check if Week column already has values
-    if "Week" in df.columns:
-        # Convert existing Week values to numeric
-        df["Week"] = pd.to_numeric(df["Week"], errors="coerce")
-        
-        # Only calculate weeks for rows where Week is NaN (empty)
-        def calc_weeks(row):
-            # If Week already has a value, keep it
-            if pd.notna(row["Week"]):
-                return row["Week"]
-                
-            start = row["Start Date"]
-            if pd.isna(start):
-                return None
-            if start > today:
-                return f"-{int((start - today).days / 7)} weeks from start"
-            return int(((today - start).days // 7) + 1)
-
-        df["Week"] = df.apply(calc_weeks, axis=1)
-        df["Week"] = pd.to_numeric(df["Week"], errors="coerce")
-
-
-    # Handle salary formatting - new format is "$65,000.00"
-    if "Salary" in df.columns:
-        df["Salary"] = (
-            df["Salary"]
-            .astype(str)
-            .str.replace("$", "")
-            .str.replace(",", "")
-            .str.replace(" ", "")
-            .str.replace(".00", "")  # Remove .00 from new format
+    df, source, as_of, error = latest_frame("roster")
+    if error is not None and source == "Error":
+        st.error(f"⚠️ Google Sheets error: {error}")
+    elif error is not None:
+        st.warning(f"⚠️ Google Sheets error: {error} — showing data from {format_age(time.time() - as_of)} ago")
+    return df, source, as_of
+
+
+def load_jobs_data():
+    jobs_df, source, as_of, error = latest_frame("jobs")
+    if error is not None and source == "Error":
+        st.error(f"Error loading jobs data: {error}")
+    elif error is not None:
+        st.warning(f"Error loading jobs data: {error} — showing data from {format_age(time.time() - as_of)} ago")
+    return jobs_df, source, as_of
+
+
+@track_cache("load_artifact", st.cache_data(ttl=ROSTER_TTL))
+def load_artifact():
+    return read_artifact(ARTIFACT_DIR)
+
+
+@st.cache_resource
+def get_score_store():
+    # One store per server process, shared by every session
+    return ScoreStore()
+
+
+@st.cache_resource
+def get_history():
+    # Refresh deltas and KPI values, appended by the refreshers' hook
+    return History()
+
+
+# ---- SHARED RESULTS (computed once per data version, for every session) ----
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(RESULT_CACHE_ENTRIES)
+
+
+def shared(name, key, compute):
+    """``compute()`` once per ``key`` across all sessions; treat the result as read-only."""
+    return get_result_cache().get(name, key, compute)
+
+
+def display_table(frame, cols, salary=False):
+    display = frame[[col for col in cols if col in frame.columns]].astype(object).fillna("—")
+    # Clean salary formatting
+    if salary and "Salary" in display.columns:
+        display["Salary"] = (
+            display["Salary"].astype(str).str.replace("$", "").str.replace(",", "").replace("nan", "TBD")
         )
-        df["Salary"] = pd.to_numeric(df["Salary"], errors="coerce")
+    return display
 
-    df["Status"] = df["Status"].astype(str).str.strip().str.lower()
-    return df, data_source
 
+def narrow(frame, labels):
+    """Rows of ``frame`` whose index is in ``labels``; every row when there is no search."""
+    return frame if labels is None else frame[frame.index.isin(labels)]
 
-@st.cache_data(ttl=300)
-def load_jobs_data():
-    # ✅ Updated Placement Options Google Sheets URL
-    jobs_url = (
-        "https://docs.google.com/spreadsheets/d/e/"
-        "2PACX-1vTAdbdhuieyA-axzb4aLe8c7zdAYXBLPNrIxKRder6j1ZAlj2g4U1k0YzkZbm_dEcSwBik4CJ57FROJ/"
-        "pub?gid=1073524035&single=true&output=csv"
+
+def search_links(top_df, by, own_hits, other_hits):
+    """``by`` positions matching the search themselves or through one of their top matches."""
+    other = "job" if by == "candidate" else "candidate"
+    linked = top_df.loc[top_df[other].isin(other_hits), by].to_numpy()
+    return np.union1d(own_hits, linked)
+
+
+def page_tables(df, jobs_df, cohort=None, metrics=None):
+    """Cohorts, KPI values and every table on the page for one data load.
+
+    ``cohort`` and ``metrics`` are computed unless given (batch artifacts
+    store them).
+    """
+    if cohort is None:
+        with stage("kpis"):
+            cohort = assign_cohorts(df)
+            metrics = kpis(cohort, jobs_df)
+    candidate_cols = ["MIT Name", "Training Site", "Location", "Week", "Salary", "Level"]
+    jobs_table = None
+    if not jobs_df.empty:
+        jobs_table = jobs_df[jobs_df["Job Title"].notna()].drop(columns=SALARY_PARTS, errors="ignore")
+    return {
+        "cohort": cohort,
+        "metrics": metrics,
+        "jobs": jobs_table,
+        "ready": display_table(cohort_frame(df, cohort, READY_COHORTS), candidate_cols, salary=True),
+        "training": display_table(cohort_frame(df, cohort, [IN_TRAINING]), candidate_cols, salary=True),
+        "offer_pending": display_table(
+            cohort_frame(df, cohort, [OFFER_PENDING]), ["MIT Name", "Training Site", "Location", "Level"]
+        ),
+        "candidates": match_candidates(df, cohort),
+    }
+
+
+def score_top_matches(candidates_df, jobs_df, data_version, view, top_k, weights):
+    """Top matches in one direction plus the score store's counters for reaching this data version."""
+    cand_feats, job_feats = shared(
+        "features", data_version, lambda: (candidate_features(candidates_df), job_features(jobs_df))
     )
-    try:
-        jobs_df = pd.read_csv(jobs_url, skiprows=5, header=0)  # Skip to data rows
-        jobs_df = jobs_df.loc[:, ~jobs_df.columns.str.contains("^Unnamed")]
-        jobs_df = jobs_df.drop(columns=[c for c in ["JV Link", "JV ID"] if c in jobs_df.columns], errors="ignore")
-        jobs_df = jobs_df.dropna(how="all").fillna("")
-        
-        # Clean jobs data - remove empty rows
-        jobs_df = jobs_df[jobs_df["Job Title"].notna() & (jobs_df["Job Title"] != "")]
-        return jobs_df
-    except Exception as e:
-        st.error(f"Error loading jobs data: {e}")
-        return pd.DataFrame()
+    # ---- Rescore only changed candidates/jobs, then keep each block's best k ----
+    score_store = get_score_store()
+    subs = score_store.update(cand_feats, job_feats, version=data_version)
+    if view == "By candidate":
+        top = top_k_from_subscores(subs, top_k, weights)
+    else:
+        top = top_candidates_from_subscores(subs, top_k, weights)
+    return top, subs["Vertical"].size, score_store.changes_for(data_version)
 
-# ---- LOAD ----
 
-df, data_source = load_data()
-jobs_df = load_jobs_data()
+# ---- PAGINATED RENDERING ----
+# Fragments rerun only their own section when a widget inside them changes
+# (st.fragment needs Streamlit >= 1.37; older versions rerun the whole page)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
 
-if df.empty:
-    st.error("❌ Unable to load data.")
-    st.stop()
+TABLE_PAGE_SIZE = 20
+MATCH_PAGE_SIZE = 25
 
-# ---- HEADER ----
-st.markdown('<div class="dashboard-title">🎓 MIT Candidate Training Dashboard</div>', unsafe_allow_html=True)
-if data_source == "Google Sheets":
-    st.success(f"📊 Data Source: {data_source} | Last Updated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-# ---- METRICS ----
-offer_pending = len(df[df["Status"] == "offer pending"])
-offer_accepted = len(df[df["Status"] == "offer accepted"])
-non_identified = len(df[df["Status"].isin(["free agent discussing opportunity", "unassigned", "training"])])
-total_candidates = non_identified + offer_accepted
-
-ready_for_placement = df[
-    df["Week"].apply(lambda x: isinstance(x, (int, float)) and x > 6)
-    & (~df["Status"].isin(["position identified", "offer pending", "offer accepted"]))
-]
-ready = len(ready_for_placement)
-
-in_training = len(
-    df[df["Status"].str.lower().eq("training") & df["Week"].apply(lambda x: isinstance(x, (int, float)) and x <= 6)]
-)
-open_jobs = len(jobs_df) if not jobs_df.empty else 0
+def page_slice(frame, page_size, key):
+    """Rows of ``frame`` for the page picked in a page selector (shown only if needed)."""
+    pages = max(1, -(-len(frame) // page_size))
+    if pages == 1:
+        return frame
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * page_size
+    st.caption(f"Showing {start + 1}–{min(start + page_size, len(frame))} of {len(frame)}")
+    return frame.iloc[start:start + page_size]
 
-col1, col2, col3, col4, col5 = st.columns(5)
-col1.metric("Total Candidates", total_candidates)
-col2.metric("Open Positions", open_jobs)
-col3.metric("Ready for Placement", ready)
-col4.metric("In Training (Weeks 1–5)", in_training)
-col5.metric("Offer Pending", offer_pending)
 
-# ---- CHART ----
-st.markdown("---")
-left_col, right_col = st.columns([1, 1])
-color_map = {
-    "Ready for Placement": "#2E91E5",
-    "In Training": "#E15F99",
-    "Offer Pending": "#A020F0",
-}
-chart_data = pd.DataFrame({
-    "Category": ["Ready for Placement", "In Training", "Offer Pending"],
-    "Count": [ready, in_training, offer_pending]
-})
+def status_chart(ready, in_training, offer_pending):
+    """Horizontal bar chart of the three headline cohorts."""
+    import plotly.express as px  # deferred: only needed once the chart is drawn
 
-with right_col:
-    st.subheader("📊 Candidate Status Overview")
-    
-    # Create horizontal bar chart including Offer Pending
     bar_data = pd.DataFrame({
         "Status": ["Ready for Placement", "In Training", "Offer Pending"],
         "Count": [ready, in_training, offer_pending]
     })
-    
     fig_bar = px.bar(
-        bar_data, 
-        x="Count", 
-        y="Status", 
+        bar_data,
+        x="Count",
+        y="Status",
         orientation='h',
-        color="Status", 
+        color="Status",
         color_discrete_map={
             "Ready for Placement": "#007bff",
-            "In Training": "#28a745", 
+            "In Training": "#28a745",
             "Offer Pending": "#ffc107"
         },
         text="Count"
     )
-    
     fig_bar.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)", 
-        plot_bgcolor="rgba(0,0,0,0)", 
-        font_color="#333333", 
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color="#333333",
         height=300,
         showlegend=False,
         margin=dict(l=0, r=0, t=0, b=0)
     )
-    
     fig_bar.update_traces(textposition='outside')
     fig_bar.update_xaxes(showgrid=False)
     fig_bar.update_yaxes(showgrid=False)
-    
-    st.plotly_chart(fig_bar, use_container_width=True)
+    return fig_bar
+
+
+@fragment
+def paged_table(display, key):
+    page = page_slice(display, TABLE_PAGE_SIZE, key)
+    st.dataframe(page, use_container_width=True, hide_index=True, height=(len(page) * 35 + 60))
+
+
+@fragment
+def render_matches(candidates_df, jobs_df, top_df, weights, shown=None):
+    """Expanders per candidate; ``shown`` limits them to those candidate positions."""
+    show = st.radio("Show", ["All", "Ready for Placement", "In Training"], horizontal=True, key="match_filter")
+
+    # Ready first, then training; later weeks and stronger best matches first
+    best = top_df[top_df["rank"] == 1].set_index("candidate")["Total Score"]
+    week = candidates_df["Week"].to_numpy(dtype=float, na_value=float("nan"))
+    candidate_order = pd.DataFrame({
+        "is_ready": (week >= 6).astype(int),
+        "Week": week,
+        "best": best.reindex(range(len(candidates_df))).to_numpy(),
+    }).sort_values(["is_ready", "Week", "best"], ascending=[False, False, False])
+    if show != "All":
+        candidate_order = candidate_order[candidate_order["is_ready"] == int(show == "Ready for Placement")]
+    if shown is not None:
+        candidate_order = candidate_order[candidate_order.index.isin(shown)]
+
+    # Expanders per candidate (ready auto-expanded), one page at a time;
+    # labels are joined onto the shown page's matches only
+    page = page_slice(candidate_order, MATCH_PAGE_SIZE, key="match_page")
+    top_by_candidate = label_matches(top_df[top_df["candidate"].isin(page.index)], jobs_df).groupby("candidate")
+    for pos in page.index:
+        candidate = candidates_df["MIT Name"].iloc[pos]
+        week = candidate_order.at[pos, "Week"]
+        status = "Ready for Placement" if week >= 6 else "In Training"
+        color = "🟢" if week >= 6 else "🟡"
+        expanded = True if week >= 6 else False
+
+        top_jobs = top_by_candidate.get_group(pos)
+        week_label = "—" if pd.isna(week) else f"{week:g}"
+        with st.expander(f"{color} {candidate} — {status} (Week {week_label})", expanded=expanded):
+            for rec in top_jobs.to_dict(orient="records"):
+                st.markdown(
+                    f"**{rec['rank']}. {rec['Title']} — {rec['Job Account']}**  \n"
+                    f"📍 {rec['City']}, {rec['State']} | 🏢 {rec['VERT']} | ⭐ Match Score: {rec['Total Score']:.1f}/100"
+                )
+            st.markdown("---")
+
+    # ---- Full pair table, only built when explicitly requested ----
+    if st.checkbox("Prepare full match table for export"):
+        full_match_df = match_pairs(candidates_df, jobs_df, weights=weights)
+        st.download_button(
+            "⬇️ Download all match scores (CSV)",
+            full_match_df.to_csv(index=False),
+            file_name="match_scores.csv",
+            mime="text/csv",
+        )
+
+
+@fragment
+def render_job_matches(candidates_df, jobs_df, top_df, shown=None):
+    """Expanders per open position listing its best candidates, strongest positions first.
+
+    ``shown`` limits them to those job positions.
+    """
+    best = top_df[top_df["rank"] == 1].set_index("job")["Total Score"]
+    job_order = best.reindex(range(len(jobs_df))).sort_values(ascending=False, kind="stable")
+    if shown is not None:
+        job_order = job_order[job_order.index.isin(shown)]
+
+    week = candidates_df["Week"].to_numpy(dtype=float, na_value=float("nan"))
+    page = page_slice(job_order, MATCH_PAGE_SIZE, key="job_match_page")
+    labels = job_labels(jobs_df.iloc[page.index])
+    top_by_job = top_df.groupby("job")
+    for pos, job in zip(page.index, labels.to_dict(orient="records")):
+        with st.expander(f"📍 {job['Title']} — {job['Job Account']} ({job['City']}, {job['State']})"):
+            for rec in top_by_job.get_group(pos).to_dict(orient="records"):
+                cand_week = week[rec["candidate"]]
+                status = "🟢 Ready for Placement" if cand_week >= 6 else "🟡 In Training"
+                week_label = "—" if pd.isna(cand_week) else f"{cand_week:g}"
+                st.markdown(
+                    f"**{rec['rank']}. {candidates_df['MIT Name'].iloc[rec['candidate']]}**  \n"
+                    f"{status} (Week {week_label}) | ⭐ Match Score: {rec['Total Score']:.1f}/100"
+                )
+
+
+# ---- LOAD ----
+if ARTIFACT_DIR:
+    try:
+        artifact = load_artifact()
+    except Exception as e:
+        st.error(f"❌ Unable to read batch artifact {ARTIFACT_DIR}: {e}")
+        st.stop()
+    df, jobs_df = artifact["roster"].drop(columns="Cohort"), artifact["jobs"]
+    data_source, roster_as_of, jobs_source, jobs_as_of = "Batch artifact", None, "Batch artifact", None
+    data_version = (ARTIFACT_DIR, artifact["meta"].get("generated_at"))
+else:
+    df, data_source, roster_as_of = load_data()
+    jobs_df, jobs_source, jobs_as_of = load_jobs_data()
+    # Changes when either sheet's content (or, for the roster, the date) does;
+    # a refresh that downloads the same bytes keeps every shared result
+    data_version = (
+        sheet_version("roster", df, data_source, roster_as_of),
+        sheet_version("jobs", jobs_df, jobs_source, jobs_as_of),
+    )
+
+if df.empty:
+    st.error("❌ Unable to load data.")
+    st.stop()
+
+# ---- HEADER ----
+render_stage = stage("render").start()
+st.markdown('<div class="dashboard-title">🎓 MIT Candidate Training Dashboard</div>', unsafe_allow_html=True)
+if data_source == "Google Sheets":
+    last_updated = pd.Timestamp.fromtimestamp(roster_as_of).strftime('%Y-%m-%d %H:%M:%S')
+    st.success(f"📊 Data Source: {data_source} | Last Updated: {last_updated}")
+elif data_source == "Snapshot":
+    st.warning(
+        f"📦 Data Source: Saved snapshot ({format_age(time.time() - roster_as_of)} old) | "
+        "Refreshing from Google Sheets in the background"
+    )
+elif data_source == "Batch artifact":
+    st.info(f"🗂️ Data Source: Batch artifact | Computed: {artifact['meta'].get('generated_at', 'unknown')}")
+if jobs_source == "Snapshot":
+    st.caption(f"📦 Open positions from a saved snapshot ({format_age(time.time() - jobs_as_of)} old)")
+
+# ---- METRICS ----
+# One cohort per candidate; every card and section below is a slice of it,
+# built by the first session to see this data and shared with the rest
+if ARTIFACT_DIR:
+    tables = shared("page_tables", data_version, lambda: page_tables(
+        df, jobs_df, artifact["roster"]["Cohort"], artifact["metrics"]
+    ))
+else:
+    tables = shared("page_tables", data_version, lambda: page_tables(df, jobs_df))
+metrics = tables["metrics"]
+ready = metrics["Ready for Placement"]
+in_training = metrics["In Training (Weeks 1–5)"]
+offer_pending = metrics["Offer Pending"]
+
+for col, (label, value) in zip(st.columns(len(metrics)), metrics.items()):
+    col.metric(label, value)
+mark("first_metric")
+
+# ---- SEARCH ----
+# The token index is built once per data load and shared; a keystroke only
+# looks up its terms, then every section below keeps the matching rows
+search_indexes = shared("search_index", data_version, lambda: build_indexes(df, jobs_df))
+query = st.sidebar.text_input(
+    "🔎 Search", key="search", placeholder="Name, site, location, VERT, account or state"
+)
+with stage("search"):
+    roster_hits = search_indexes["roster"].search(query)
+    job_hits = search_indexes["jobs"].search(query)
+matched_roster = None if roster_hits is None else df.index[roster_hits]
+matched_jobs = None if job_hits is None else jobs_df.index[job_hits]
+if roster_hits is not None:
+    st.sidebar.caption(f"{len(roster_hits)} candidates and {len(job_hits)} open positions match.")
+
+# ---- CHART AND OPEN POSITIONS ----
+# The chart's slot is filled in after the candidate tables, so the plotting
+# library is imported only once the cheaper sections are on screen
+st.markdown("---")
+left_col, right_col = st.columns([1, 1])
+
+with right_col:
+    st.subheader("📊 Candidate Status Overview")
+    chart_slot = st.empty()
 
 with left_col:
     st.subheader("📍 Open Job Positions")
-    if not jobs_df.empty:
-        clean_jobs_df = jobs_df[jobs_df["Job Title"].notna()]
-        st.dataframe(clean_jobs_df, use_container_width=True, height=400, hide_index=True)
+    if tables["jobs"] is not None:
+        st.dataframe(narrow(tables["jobs"], matched_jobs), use_container_width=True, height=400, hide_index=True)
     else:
         st.markdown('<div class="placeholder-box">No job positions data available</div>', unsafe_allow_html=True)
 
 # ==========================================================
 # READY FOR PLACEMENT SECTION
 # ==========================================================
-ready_df = df[
-    df["Week"].apply(lambda x: isinstance(x, (int, float)) and x > 6)
-    & (~df["Status"].isin(["position identified", "offer pending", "offer accepted"]))
-    & (df["Status"].notna())
-]
+ready_display = narrow(tables["ready"], matched_roster)
 
-if not ready_df.empty:
+if not ready_display.empty:
     st.markdown("---")
     st.markdown("### 🧩 Ready for Placement Candidates")
 
-    # Select relevant columns dynamically
-    ready_cols = [col for col in ["MIT Name", "Training Site", "Location", "Week", "Salary", "Level"] if col in ready_df.columns]
-    ready_display = ready_df[ready_cols].copy().fillna("—")
-
-    # Clean salary formatting
-    if "Salary" in ready_display.columns:
-        ready_display["Salary"] = (
-            ready_display["Salary"].astype(str).str.replace("$", "").str.replace(",", "").replace("nan", "TBD")
-        )
-
-    # Show table
-    st.dataframe(
-        ready_display,
-        use_container_width=True,
-        hide_index=True,
-        height=(len(ready_display) * 35 + 60),
-    )
+    # Show table, one page at a time
+    paged_table(ready_display, key="ready_page")
     st.caption(f"{len(ready_display)} candidates are ready for placement — week > 6 and not yet placed.")
 else:
     st.markdown('<div class="placeholder-box">No candidates currently ready for placement</div>', unsafe_allow_html=True)
@@ -400,33 +549,20 @@ else:
 # ==========================================================
 # IN TRAINING SECTION
 # ==========================================================
-in_training_df = df[
-    df["Status"].str.lower().eq("training")
-    & df["Week"].apply(lambda x: isinstance(x, (int, float)) and x <= 6)
-]
+train_display = narrow(tables["training"], matched_roster)
 
-if not in_training_df.empty:
+if not train_display.empty:
     st.markdown("---")
     st.markdown("### 🏋️ In Training (Weeks 1–5)")
 
-    train_cols = [col for col in ["MIT Name", "Training Site", "Location", "Week", "Salary", "Level"] if col in in_training_df.columns]
-    train_display = in_training_df[train_cols].copy().fillna("—")
-
-    if "Salary" in train_display.columns:
-        train_display["Salary"] = (
-            train_display["Salary"].astype(str).str.replace("$", "").str.replace(",", "").replace("nan", "TBD")
-        )
-
-    st.dataframe(
-        train_display,
-        use_container_width=True,
-        hide_index=True,
-        height=(len(train_display) * 35 + 60),
-    )
+    paged_table(train_display, key="training_page")
     st.caption(f"{len(train_display)} candidates currently in training (weeks 1–5).")
 else:
     st.markdown('<div class="placeholder-box">No candidates currently in training</div>', unsafe_allow_html=True)
 
+with stage("chart"):
+    chart_slot.plotly_chart(status_chart(ready, in_training, offer_pending), use_container_width=True)
+
 # ==========================================================
 # 🎯 CANDIDATE–JOB MATCH SCORE SECTION (Streamlined Executive View)
 # ==========================================================
@@ -434,173 +570,63 @@ st.markdown("---")
 st.markdown("### 🎯 Placement Readiness Breakdown")
 
 # Filter relevant candidates
-candidates_df = df[
-    df["Status"].isin(["training", "unassigned", "free agent discussing opportunity"])
-].copy()
-candidates_df = candidates_df.dropna(subset=["MIT Name"])
-
-if not jobs_df.empty and not candidates_df.empty:
-
-    # ---- Salary parsing logic ----
-
-    def parse_salary(s):
-        if pd.isna(s):
-            return None
-        if isinstance(s, (int, float)):
-            return float(s)
-    
-        # Clean string
-        s = str(s).replace("$", "").replace(",", "").replace(".00", "").strip()
-    
-        # Normalize formats like "70,000 - 75,000" or "70k-75k" or "65000"
-        s = s.lower().replace("k", "000").replace("–", "-").replace("—", "-").replace("_", "-")
-    
-        if "-" in s:
-            try:
-                low, high = s.split("-")
-                return (float(low.strip()), float(high.strip()))
-            except ValueError:
-                return None
-        else:
-            try:
-                return float(s)
-            except ValueError:
-                return None
-
-    def midpoint(val):
-        if isinstance(val, tuple):
-            return (val[0] + val[1]) / 2
-        return val if isinstance(val, (int, float)) else None
-
-
-# ---- Apply salary parsing and midpoint logic ----
-    jobs_df["SalaryRange"] = jobs_df["Salary"].apply(parse_salary)
-    candidates_df["SalaryRange"] = candidates_df["Salary"].apply(parse_salary)
-    
-    jobs_df["SalaryMid"] = jobs_df["SalaryRange"].apply(midpoint)
-    candidates_df["SalaryMid"] = candidates_df["SalaryRange"].apply(midpoint)
-
-
-    # ---- Calculate match scores (your scoring stays the same) ----
-    match_results = []
-    for _, c in candidates_df.iterrows():
-        for _, j in jobs_df.iterrows():
-            subscores = {}
-
-            # 1) Vertical Alignment
-            vert_score = 0
-            c_vert = str(c.get("VERT", "")).strip().upper()
-            j_vert = str(j.get("VERT", j.get("Vertical", ""))).strip().upper()
-            if c_vert == j_vert:
-                vert_score += 30
-            exp_str = " ".join(
-                str(c.get(k, "")).lower()
-                for k in c.index if any(x in k.lower() for x in ["experience", "notes", "background"])
-            )
-            if "amazon" in exp_str or "aviation" in exp_str:
-                vert_score += 10
-            subscores["Vertical"] = vert_score
-
-            # 2) Salary Trajectory
-            c_sal, j_sal = c.get("SalaryMid"), j.get("SalaryMid")
-            if j_sal and c_sal:
-                if j_sal >= 1.05 * c_sal:
-                    sal_score = 25
-                elif abs(j_sal - c_sal) / c_sal <= 0.05:
-                    sal_score = 15
-                elif j_sal < 0.95 * c_sal:
-                    sal_score = -10
-                else:
-                    sal_score = 0
-            else:
-                sal_score = 0
-            subscores["Salary"] = sal_score
-
-            # 3) Geographic Fit
-            geo_score = 5
-            cand_loc = str(c.get("Location", "")).strip().lower()
-            job_city = str(j.get("City", "")).strip().lower()
-            job_state = str(j.get("State", "")).strip().upper()
-            if cand_loc == job_city:
-                geo_score = 20
-            elif cand_loc.endswith(job_state.lower()):
-                geo_score = 10
-            subscores["Geo"] = geo_score
-
-            # 4) Confidence
-            conf = str(c.get("Confidence", "")).lower()
-            if "high" in conf:
-                conf_score = 15
-            elif "mod" in conf:
-                conf_score = 10
-            elif "low" in conf:
-                conf_score = 5
-            else:
-                conf_score = 10
-            subscores["Confidence"] = conf_score
-
-            # 5) Readiness
-            week = c.get("Week")
-            if isinstance(week, (int, float)):
-                if week >= 6:
-                    ready_score = 10
-                elif 1 <= week <= 5:
-                    ready_score = week * 1.5
-                else:
-                    ready_score = 5
-            else:
-                ready_score = 5
-            subscores["Readiness"] = ready_score
-
-            total = sum(subscores.values())
-
-            # Safe access for fields that may vary by sheet
-            title_val = j.get("Title") or j.get("Job Title") or "—"
-            vert_val = j.get("VERT") or j.get("Vertical") or "—"
-            acct_val = j.get("Account") or j.get("Job Account") or "—"
-
-            match_results.append({
-                "Candidate": c["MIT Name"],
-                "Job Account": acct_val,
-                "Title": title_val,
-                "City": j.get("City", ""),
-                "State": j.get("State", ""),
-                "VERT": vert_val,
-                "Total Score": round(total, 1),
-                "Week": c.get("Week"),
-                "Status": c.get("Status")
-            })
-
-    match_df = pd.DataFrame(match_results)
-    match_df = match_df.sort_values("Total Score", ascending=False)
-
-    # Ready first, then training
-    match_df["is_ready"] = (match_df["Week"] >= 6).astype(int)
-    match_df = match_df.sort_values(["is_ready", "Week", "Total Score"], ascending=[False, False, False])
-
-    # Expanders per candidate (ready auto-expanded)
-    for candidate, group in match_df.groupby("Candidate", sort=False):
-        week = group["Week"].iloc[0]
-        status = "Ready for Placement" if week >= 6 else "In Training"
-        color = "🟢" if week >= 6 else "🟡"
-        expanded = True if week >= 6 else False
-
-        top_jobs = group.nlargest(3, "Total Score")
-        with st.expander(f"{color} {candidate} — {status} (Week {int(week)})", expanded=expanded):
-            # iterate with dicts -> no KeyError from spaces/underscores
-            for idx, rec in enumerate(top_jobs.to_dict(orient="records"), start=1):
-                title = rec.get("Title", "—")
-                account = rec.get("Job Account") or rec.get("Job_Account") or rec.get("Account") or "—"
-                city = rec.get("City", "")
-                state = rec.get("State", "")
-                vert = rec.get("VERT", "—")
-                score = rec.get("Total Score", 0)
+candidates_df = tables["candidates"]
+if roster_hits is not None:
+    candidate_hits = np.flatnonzero(candidates_df.index.isin(matched_roster))
+
+if ARTIFACT_DIR and not artifact["matches"].empty:
+    # Precomputed with the default weights; only the number shown can change
+    stored_k = int(artifact["matches"]["rank"].max())
+    top_k = st.sidebar.slider("Top matches per candidate", min_value=1, max_value=stored_k, value=min(3, stored_k))
+    top_df = artifact["matches"][artifact["matches"]["rank"] <= top_k]
+    shown = None if roster_hits is None else search_links(top_df, "candidate", candidate_hits, job_hits)
+    render_matches(candidates_df, jobs_df, top_df, None, shown)
+    st.caption("🗂️ Match scores precomputed by pipeline.py.")
+
+elif not jobs_df.empty and not candidates_df.empty:
+
+    # Both views read the same score matrix; only the direction of the top-k differs
+    view = st.radio("View", ["By candidate", "By open position"], horizontal=True, key="match_view")
+    top_k = st.sidebar.slider("Top matches per candidate / position", min_value=1, max_value=10, value=3)
+
+    # ---- What-if weights: re-ranking is a weighted sum over cached subscores ----
+    st.sidebar.markdown("### ⚖️ Match Score Weights")
+    st.sidebar.caption("Maximum points each component can add to a match score.")
+    weight_labels = {
+        "Vertical": "Vertical Alignment",
+        "Salary": "Salary Trajectory",
+        "Geo": "Geographic Fit",
+        "Confidence": "Confidence Level",
+        "Readiness": "Readiness",
+    }
+    weights = {
+        name: st.sidebar.slider(label, 0, 2 * MAX_POINTS[name], MAX_POINTS[name]) / MAX_POINTS[name]
+        for name, label in weight_labels.items()
+    }
+    with stage("score"):
+        # Sessions with the same data, view, k and weights share one result
+        top_df, n_cells, store_stats = shared(
+            "top_matches",
+            (data_version, view, top_k, tuple(weights.items())),
+            lambda: score_top_matches(candidates_df, jobs_df, data_version, view, top_k, weights),
+        )
 
-                st.markdown(
-                    f"**{idx}. {title} — {account}**  \n"
-                    f"📍 {city}, {state} | 🏢 {vert} | ⭐ Match Score: {score}/100"
-                )
-            st.markdown("---")
+    # A search keeps candidates (or positions) that match it or are matched to one that does
+    if view == "By candidate":
+        shown = None if roster_hits is None else search_links(top_df, "candidate", candidate_hits, job_hits)
+        render_matches(candidates_df, jobs_df, top_df, weights, shown)
+    else:
+        shown = None if roster_hits is None else search_links(top_df, "job", job_hits, candidate_hits)
+        render_job_matches(candidates_df, jobs_df, top_df, shown)
+
+    # Rescoring happens when new data arrives (usually on the refresher), not per run
+    if store_stats is not None:
+        st.caption(
+            f"♻️ {store_stats['cells_recomputed']:,} of {n_cells:,} match scores recomputed for this data "
+            f"({store_stats['rows_recomputed']} candidates, {store_stats['cols_recomputed']} jobs changed)."
+        )
+    if run.cache.get("top_matches") == "hit":
+        st.caption("♻️ Top matches reused from an earlier run with the same data and weights.")
 
 else:
     st.markdown(
@@ -612,11 +638,99 @@ else:
 
 
 # ---- OFFER PENDING SECTION ----
-offer_pending_df = df[df["Status"].str.lower() == "offer pending"]
-if not offer_pending_df.empty:
+offer_pending_display = narrow(tables["offer_pending"], matched_roster)
+if not offer_pending_display.empty:
     st.markdown("---")
     st.markdown("### 🤝 Offer Pending Candidates")
-    display_cols = [c for c in ["MIT Name", "Training Site", "Location", "Level"] if c in offer_pending_df.columns]
-    offer_pending_display = offer_pending_df[display_cols].fillna("—")
-    st.dataframe(offer_pending_display, use_container_width=True, hide_index=True)
+    paged_table(offer_pending_display, key="offer_pending_page")
     st.caption(f"{len(offer_pending_display)} candidates with pending offers – awaiting final approval/acceptance")
+
+# ---- TRENDS ----
+# Read from the refresh history (history.py), once per data version and
+# history write: a viewer can arrive after a refresh is published but before
+# it is recorded, and that read must not be kept for the whole version
+st.markdown("---")
+st.markdown("### 📈 Trends")
+with stage("trends"):
+    history = get_history()
+    kpi_trend, placement_trend = shared(
+        "trends", (data_version, history.writes), lambda: (history.kpi_trend(), history.time_to_placement())
+    )
+if kpi_trend.empty:
+    st.markdown('<div class="placeholder-box">No history recorded yet</div>', unsafe_allow_html=True)
+else:
+    kpi_col, placement_col = st.columns([1, 1])
+    with kpi_col:
+        st.markdown("**KPIs by week**")
+        st.line_chart(kpi_trend)
+        st.dataframe(
+            kpi_trend.diff().iloc[1:].astype(object).fillna("—"),
+            use_container_width=True, height=180,
+        )
+        st.caption("Week-over-week change of each metric card, by week starting Monday.")
+    with placement_col:
+        st.markdown("**Time to placement**")
+        if placement_trend.empty:
+            st.caption("No placements seen happening yet.")
+        else:
+            st.bar_chart(placement_trend["median days"])
+            st.caption(
+                f"Median days from start date to offer accepted, by week placed "
+                f"({int(placement_trend['placements'].sum())} placements)."
+            )
+
+# ---- DIAGNOSTICS ----
+render_stage.stop()
+run.finish()
+
+with st.expander("🩺 Diagnostics", expanded=False):
+    stage_df = pd.DataFrame(run.stages, columns=["stage", "detail", "seconds", "peak_rss_growth_mb"])
+    st.dataframe(
+        stage_df.rename(columns={"peak_rss_growth_mb": "peak RSS growth (MB)"}).astype(object).fillna("—"),
+        use_container_width=True, hide_index=True,
+    )
+    first_metric = run.marks.get("first_metric")
+    st.caption(
+        f"{run.seconds:.3f}s from start to last section this run"
+        + (f", first metric card after {first_metric:.3f}s" if first_metric is not None else "")
+        + ". Render includes the kpis, chart and score stages; fetch, parse and clean run on the "
+        "background refreshers below."
+    )
+    if not ARTIFACT_DIR:
+        now = time.time()
+        refresh_rows = []
+        for name, refresher in get_refreshers().items():
+            refreshed = refresher.latest()
+            refresh_rows.append({
+                "sheet": name,
+                "refreshes": refreshed.refreshes if refreshed else 0,
+                "failures in a row": refreshed.failures if refreshed else 0,
+                "last load (s)": round(refreshed.seconds, 3) if refreshed and refreshed.seconds else "—",
+                "data age": format_age(refreshed.age) if refreshed and refreshed.value is not None else "—",
+                "next refresh in": format_age(max(refresher.next_at - now, 0)) if refresher.next_at else "—",
+            })
+        st.dataframe(pd.DataFrame(refresh_rows), use_container_width=True, hide_index=True)
+        # Stages of each sheet's last good load, timed on its refresher
+        refresh_stages = pd.DataFrame(
+            [
+                {"sheet": name, **record}
+                for name, refresher in get_refreshers().items()
+                for record in (refresher.latest().stages if refresher.latest() else [])
+            ],
+            columns=["sheet", "stage", "detail", "seconds", "peak_rss_growth_mb"],
+        )
+        st.dataframe(
+            refresh_stages.rename(columns={"peak_rss_growth_mb": "peak RSS growth (MB)"}).astype(object).fillna("—"),
+            use_container_width=True, hide_index=True,
+        )
+        totals = get_score_store().stats
+        st.caption(
+            f"Score store: {totals['updates']} updates, {totals['total_cells_recomputed']:,} match scores "
+            f"recomputed and {totals['total_cells_reused']:,} reused since the server started."
+        )
+    cache_df = pd.DataFrame([
+        {"cache": name, "this run": run.cache.get(name, "—"), **counts,
+         "hit rate": f"{counts['hits'] / max(counts['hits'] + counts['misses'], 1):.0%}"}
+        for name, counts in cache_counts().items()
+    ])
+    st.dataframe(cache_df, use_container_width=True, hide_index=True)
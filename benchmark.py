@@ -0,0 +1,232 @@
+"""Time and memory benchmarks for ingestion, the KPI block and match scoring.
+
+Each scale writes synthetic sheets (see ``synthetic.py``) and runs these
+stages over them:
+
+- ``ingest``: read and clean both CSVs (``pipeline.load_roster`` /
+  ``load_jobs``), parsing only the declared roster columns and declared dtypes
+- ``ingest_full``: the same, parsing every column as ``read_csv`` infers it
+- ``ingest_chunked``: pruned, parsed and cleaned ``CHUNK_ROWS`` rows at a time
+- ``kpis``: cohort assignment and the metric card values
+- ``scoring``: feature tables and every matched candidate's top-3 jobs
+
+Time is the best of ``--repeat`` runs; peak memory comes from a separate
+``tracemalloc`` run, so it covers Python and NumPy allocations but not
+Arrow-backed string buffers.  The ingest stages are also run once in a
+fresh process that adds the Arrow memory pool's peak to the traced peak
+("peak MB incl. Arrow").  Save a baseline on a known-good tree, then
+compare::
+
+    python benchmark.py --save
+    python benchmark.py            # exits 1 on any regression past the thresholds
+
+Baselines are machine-specific, so they live under the git-ignored
+``.benchmarks/`` directory.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+from concurrent.futures import ProcessPoolExecutor
+
+from cohorts import assign_cohorts, kpis
+from features import candidate_features, job_features
+from pipeline import load_jobs, load_roster, match_candidates
+from scoring import top_matches
+from synthetic import write_sheets
+
+# Candidates x jobs
+SCALES = {
+    "50x50": (50, 50),
+    "500x500": (500, 500),
+    "2000x2000": (2000, 2000),
+    "10000x10000": (10_000, 10_000),
+}
+STAGES = ["ingest", "ingest_full", "ingest_chunked", "kpis", "scoring"]
+CHUNK_ROWS = 2000
+
+# load_roster / load_jobs options for each ingest stage
+INGEST_MODES = {
+    "ingest": {"pruned": True},
+    "ingest_full": {"pruned": False},
+    "ingest_chunked": {"pruned": True, "chunksize": CHUNK_ROWS},
+}
+
+BASELINE_PATH = os.path.join(".benchmarks", "baseline.json")
+TIME_THRESHOLD = 0.25  # fail when a stage is more than 25% slower...
+MEMORY_THRESHOLD = 0.25  # ...or peaks 25% higher than the baseline
+MIN_SECONDS = 0.005  # ignore timing changes below this (noise)
+MIN_MB = 1.0  # ignore memory changes below this
+
+
+def _measure(func, repeat):
+    """Best wall time over ``repeat`` runs, then peak traced memory of one more."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_mb": peak / 2**20}
+
+
+def _ingest(roster_path, jobs_path, today, options):
+    return load_roster(roster_path, today=today, **options), load_jobs(jobs_path, **options)
+
+
+def _ingest_peak(roster_path, jobs_path, today, options):
+    """Runs in a fresh process: traced peak plus Arrow pool peak of one ingest (MB)."""
+    arrow = pa.default_memory_pool()
+    arrow_before = arrow.max_memory()
+    tracemalloc.start()
+    try:
+        _ingest(roster_path, jobs_path, today, options)
+        _, traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (traced + arrow.max_memory() - arrow_before) / 2**20
+
+
+def _measure_total_peak(roster_path, jobs_path, today, options):
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(_ingest_peak, roster_path, jobs_path, today, options).result()
+
+
+def run_scale(candidates, jobs, repeat=3, data_dir=None, today="2025-01-15", stages=STAGES):
+    """Benchmark ``stages`` at one size; returns stage -> {"seconds", "peak_mb"[, "total_mb"]}."""
+    with tempfile.TemporaryDirectory() as tmp:
+        roster_path, jobs_path = write_sheets(data_dir or tmp, candidates, jobs, today=today)
+        df, jobs_df = _ingest(roster_path, jobs_path, today, INGEST_MODES["ingest"])
+        candidates_df = match_candidates(df, assign_cohorts(df))
+
+        results = {}
+        for name in stages:
+            if name in INGEST_MODES:
+                options = INGEST_MODES[name]
+                results[name] = _measure(lambda: _ingest(roster_path, jobs_path, today, options), repeat)
+                results[name]["total_mb"] = _measure_total_peak(roster_path, jobs_path, today, options)
+            elif name == "kpis":
+                results[name] = _measure(lambda: kpis(assign_cohorts(df), jobs_df), repeat)
+            elif name == "scoring":
+                results[name] = _measure(
+                    lambda: top_matches(candidate_features(candidates_df), job_features(jobs_df), k=3), repeat
+                )
+        return results
+
+
+def compare(results, baseline, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    """Regressions of ``results`` against ``baseline``, as readable strings."""
+    regressions = []
+    for scale, stages in results.items():
+        for stage, now in stages.items():
+            before = baseline.get(scale, {}).get(stage)
+            if before is None:
+                continue
+            if (now["seconds"] > before["seconds"] * (1 + time_threshold)
+                    and now["seconds"] - before["seconds"] > MIN_SECONDS):
+                regressions.append(
+                    f"{scale} {stage}: {now['seconds']:.3f}s vs {before['seconds']:.3f}s baseline "
+                    f"(+{now['seconds'] / before['seconds'] - 1:.0%})"
+                )
+            for key, label in [("peak_mb", "peak"), ("total_mb", "peak incl. Arrow")]:
+                if now.get(key) is None or before.get(key) is None:
+                    continue
+                if now[key] > before[key] * (1 + memory_threshold) and now[key] - before[key] > MIN_MB:
+                    regressions.append(
+                        f"{scale} {stage}: {now[key]:.1f} MB {label} vs {before[key]:.1f} MB baseline "
+                        f"(+{now[key] / max(before[key], 1e-9) - 1:.0%})"
+                    )
+    return regressions
+
+
+def ingest_report(results):
+    """Declared-column and chunked ingestion against the full-column path, per scale."""
+    lines = []
+    for scale, stages in results.items():
+        full = stages.get("ingest_full")
+        if full is None:
+            continue
+        for name in ["ingest", "ingest_chunked"]:
+            if name not in stages:
+                continue
+            now = stages[name]
+            line = f"{scale} {name}: {now['seconds'] / full['seconds']:.0%} of the full-column time"
+            if full.get("total_mb"):
+                line += f", {now['total_mb'] / full['total_mb']:.0%} of its peak memory"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def format_table(results, baseline=None):
+    rows = []
+    for scale, stages in results.items():
+        for stage, now in stages.items():
+            before = (baseline or {}).get(scale, {}).get(stage)
+            rows.append({
+                "scale": scale,
+                "stage": stage,
+                "seconds": round(now["seconds"], 4),
+                "peak MB": round(now["peak_mb"], 1),
+                "peak MB incl. Arrow": round(now["total_mb"], 1) if "total_mb" in now else None,
+                "baseline s": round(before["seconds"], 4) if before else None,
+                "baseline MB": round(before["peak_mb"], 1) if before else None,
+            })
+    return pd.DataFrame(rows).to_string(index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ingestion, KPIs and match scoring on synthetic data.")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scale in args.scales:
+        print(f"Running {scale}...", file=sys.stderr)
+        results[scale] = run_scale(*SCALES[scale], repeat=args.repeat, stages=args.stages)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(format_table(results, baseline))
+    report = ingest_report(results)
+    if report:
+        print(report)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**(baseline or {}), **results}, f, indent=2)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save first.", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.time_threshold, args.memory_threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
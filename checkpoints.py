@@ -0,0 +1,53 @@
+"""Content-hash checkpoints for the refresh pipeline.
+
+Each stage keeps its last output together with a hash of its inputs, and
+reuses that output while the hash is unchanged.  For a sheet the inputs are
+the downloaded bytes (their SHA-256 from ``fetch.SheetFetcher``), the parse
+options and, for the roster, today's date, on which Week depends.  Identical
+bytes on the same day therefore skip parsing and cleaning and hand back the
+very same frame, and the frame's key doubles as the data version under which
+every later stage (features, scores, tables) is cached, so those are reused
+too.  Hits and misses are counted with ``instrument.record_cache``.
+"""
+import hashlib
+import threading
+
+from instrument import record_cache
+
+
+def content_key(*parts):
+    """Short stable hash of ``parts``, which must have a deterministic ``repr``."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+
+
+class Checkpoints:
+    """Last ``(key, output)`` per stage name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, name, key, compute):
+        """The stored output of ``name`` if its key is ``key``, else ``compute()``'s, stored."""
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            record_cache(f"checkpoint:{name}", hit=True)
+            return entry[1]
+        record_cache(f"checkpoint:{name}", hit=False)
+        value = compute()
+        with self._lock:
+            self._entries[name] = (key, value)
+        return value
+
+    def latest(self, name):
+        """The stored output of ``name``, or None."""
+        with self._lock:
+            entry = self._entries.get(name)
+        return None if entry is None else entry[1]
+
+    def key_of(self, name, value):
+        """Key ``value`` is stored under for ``name``, or None if it is not the stored output."""
+        with self._lock:
+            entry = self._entries.get(name)
+        return entry[0] if entry is not None and entry[1] is value else None
@@ -0,0 +1,79 @@
+"""Single-pass cohort assignment and the KPI cards built from it.
+
+Every roster row lands in exactly one cohort, decided in one ``np.select``
+over Status and Week.  The metric cards and the Ready / In Training /
+Offer Pending tables are then counts and slices of that one column.
+"""
+import numpy as np
+import pandas as pd
+
+ACTIVE_STATUSES = ["training", "unassigned", "free agent discussing opportunity"]
+
+OFFER_PENDING = "Offer Pending"
+OFFER_ACCEPTED = "Offer Accepted"
+POSITION_IDENTIFIED = "Position Identified"
+READY = "Ready for Placement"
+READY_OTHER = "Ready for Placement (Other Status)"
+IN_TRAINING = "In Training"
+AWAITING = "Awaiting Placement"
+OTHER = "Other"
+
+COHORTS = [
+    OFFER_PENDING, OFFER_ACCEPTED, POSITION_IDENTIFIED,
+    READY, READY_OTHER, IN_TRAINING, AWAITING, OTHER,
+]
+
+# Cohorts that make up each dashboard section
+READY_COHORTS = [READY, READY_OTHER]
+MATCH_COHORTS = [READY, IN_TRAINING, AWAITING]
+TOTAL_COHORTS = [READY, IN_TRAINING, AWAITING, OFFER_ACCEPTED]
+
+
+def assign_cohorts(df):
+    """Cohort of every roster row as a categorical Series.
+
+    Ready means Week > 6 and no offer or position yet; In Training means
+    status "training" at Week <= 6.  Active candidates that are neither land
+    in Awaiting Placement.
+    """
+    status = df["Status"].astype(str)
+    week = df["Week"]
+    past_training = week.gt(6).fillna(False).to_numpy(dtype=bool)
+    in_window = week.le(6).fillna(False).to_numpy(dtype=bool)
+    active = status.isin(ACTIVE_STATUSES).to_numpy()
+
+    cohort = np.select(
+        [
+            (status == "offer pending").to_numpy(),
+            (status == "offer accepted").to_numpy(),
+            (status == "position identified").to_numpy(),
+            past_training & active,
+            past_training,
+            (status == "training").to_numpy() & in_window,
+            active,
+        ],
+        [OFFER_PENDING, OFFER_ACCEPTED, POSITION_IDENTIFIED, READY, READY_OTHER, IN_TRAINING, AWAITING],
+        default=OTHER,
+    )
+    return pd.Series(pd.Categorical(cohort, categories=COHORTS), index=df.index, name="Cohort")
+
+
+def cohort_counts(cohort):
+    return cohort.value_counts().reindex(COHORTS, fill_value=0)
+
+
+def kpis(cohort, jobs_df):
+    """The five metric cards, in display order."""
+    counts = cohort_counts(cohort)
+    return {
+        "Total Candidates": int(counts[TOTAL_COHORTS].sum()),
+        "Open Positions": len(jobs_df),
+        "Ready for Placement": int(counts[READY_COHORTS].sum()),
+        "In Training (Weeks 1–5)": int(counts[IN_TRAINING]),
+        "Offer Pending": int(counts[OFFER_PENDING]),
+    }
+
+
+def cohort_frame(df, cohort, names):
+    """Rows of ``df`` whose cohort is one of ``names``, in roster order."""
+    return df[cohort.isin(names)]
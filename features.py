@@ -0,0 +1,133 @@
+"""Per-entity feature extraction for match scoring.
+
+Everything the scorer needs from a roster or jobs row is normalized here,
+once per data refresh, into a compact feature table indexed like the source
+frame.  Pair scoring in ``scoring.py`` then only compares these columns.
+"""
+import numpy as np
+import pandas as pd
+
+from ingest import EXPERIENCE_KEYWORDS, parse_salaries
+from locations import default_index
+
+EXPERIENCE_TERMS = ["amazon", "aviation"]
+
+CONFIDENCE_TIERS = ["high", "moderate", "low", "unknown"]
+
+
+# ---- Helpers ----
+
+def _text(df, col, default=""):
+    """``str()`` of every value in ``col``, matching ``str(row.get(col, default))``."""
+    if col not in df.columns:
+        return pd.Series([str(default)] * len(df), index=df.index, dtype=object)
+    return df[col].map(str)
+
+
+def _numeric_or_nan(values):
+    """Keep real numbers, turn everything else into NaN."""
+    return np.array(
+        [v if isinstance(v, (int, float)) else np.nan for v in values], dtype=float
+    )
+
+
+def _experience_flag(candidates_df):
+    """True where any experience/notes/background column mentions amazon or aviation."""
+    cols = [
+        k for k in candidates_df.columns
+        if any(x in k.lower() for x in EXPERIENCE_KEYWORDS)
+    ]
+    flag = np.zeros(len(candidates_df), dtype=bool)
+    for col in cols:
+        text = candidates_df[col].map(str).str.lower()
+        for term in EXPERIENCE_TERMS:
+            flag |= text.str.contains(term, regex=False).to_numpy(dtype=bool)
+    return flag
+
+
+def _confidence_tier(candidates_df):
+    conf = _text(candidates_df, "Confidence").str.lower()
+    tier = np.select(
+        [conf.str.contains("high", regex=False), conf.str.contains("mod", regex=False),
+         conf.str.contains("low", regex=False)],
+        ["high", "moderate", "low"],
+        default="unknown",
+    )
+    return pd.Categorical(tier, categories=CONFIDENCE_TIERS)
+
+
+def _week(candidates_df):
+    if "Week" not in candidates_df.columns:
+        return np.full(len(candidates_df), np.nan)
+    week = candidates_df["Week"]
+    if pd.api.types.is_numeric_dtype(week) and not pd.api.types.is_bool_dtype(week):
+        return week.to_numpy(dtype=float, na_value=np.nan)
+    return _numeric_or_nan(week)
+
+
+def _salary_mid(df):
+    """Salary midpoints as float64, from the ingested "Salary Mid" when present."""
+    if "Salary Mid" in df.columns:
+        return df["Salary Mid"].to_numpy(dtype=float, na_value=np.nan)
+    if "Salary" in df.columns:
+        return parse_salaries(df["Salary"])["Salary Mid"].to_numpy(dtype=float)
+    return np.full(len(df), np.nan)
+
+
+def _first_truthy(jobs_df, cols):
+    """Per job, the first truthy value among ``cols`` — or "—"."""
+    present = [c for c in cols if c in jobs_df.columns]
+    if not present:
+        return ["—"] * len(jobs_df)
+    rows = zip(*(jobs_df[c] for c in present))
+    return [next((v for v in row if v), "—") for row in rows]
+
+
+# ---- Feature tables ----
+
+def candidate_features(candidates_df):
+    """Scoring features for each roster row.
+
+    Columns: ``vert`` (stripped, upper-cased VERT), ``experience`` (amazon or
+    aviation mentioned in any experience/notes/background column),
+    ``confidence`` (one of ``CONFIDENCE_TIERS``), ``week`` (NaN unless
+    numeric), ``salary_mid``, and Location resolved by
+    ``locations.LocationIndex`` into ``loc_key``, ``loc_state``, ``lat`` and
+    ``lon``.
+    """
+    return pd.DataFrame({
+        "vert": _text(candidates_df, "VERT").str.strip().str.upper(),
+        "experience": _experience_flag(candidates_df),
+        "confidence": _confidence_tier(candidates_df),
+        "week": _week(candidates_df),
+        "salary_mid": _salary_mid(candidates_df),
+    }, index=candidates_df.index).join(default_index().resolve(_text(candidates_df, "Location")))
+
+
+def job_features(jobs_df):
+    """Scoring features for each job row.
+
+    Columns: ``vert`` (VERT, else Vertical, stripped and upper-cased),
+    ``salary_mid``, and City plus State resolved like a candidate's Location
+    (``loc_key``, ``loc_state``, ``lat``, ``lon``).
+    """
+    vert_col = "VERT" if "VERT" in jobs_df.columns else "Vertical"
+    city, state = _text(jobs_df, "City").str.strip(), _text(jobs_df, "State").str.strip()
+    return pd.DataFrame({
+        "vert": _text(jobs_df, vert_col).str.strip().str.upper(),
+        "salary_mid": _salary_mid(jobs_df),
+    }, index=jobs_df.index).join(default_index().resolve(city + ", " + state))
+
+
+def job_labels(jobs_df):
+    """Display labels per job, using whichever column variant the sheet has."""
+    def col(name):
+        return jobs_df[name] if name in jobs_df.columns else pd.Series("", index=jobs_df.index)
+
+    return pd.DataFrame({
+        "Job Account": _first_truthy(jobs_df, ["Account", "Job Account"]),
+        "Title": _first_truthy(jobs_df, ["Title", "Job Title"]),
+        "City": col("City"),
+        "State": col("State"),
+        "VERT": _first_truthy(jobs_df, ["VERT", "Vertical"]),
+    }, index=jobs_df.index)
@@ -0,0 +1,112 @@
+"""Concurrent, conditional fetching of the published Google Sheets CSVs.
+
+One ``requests.Session`` with a small connection pool is shared by every
+download, so repeat fetches reuse open HTTPS connections.  Each request
+carries the validators from the previous response (ETag / Last-Modified);
+a 304, or a 200 whose body hashes the same as last time, counts as
+"unchanged" and ``read_csv`` hands back the frame it already parsed.
+"""
+import hashlib
+import io
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Sheet:
+    """Last known response for one URL."""
+
+    def __init__(self, url):
+        self.url = url
+        self.body = b""
+        self.digest = ""
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = 0.0
+        self.changed = False
+        self.requests = 0
+        self.not_modified = 0
+
+
+class SheetFetcher:
+    """Downloads CSV sheets over a pooled session with conditional requests."""
+
+    def __init__(self, session=None, timeout=30, max_workers=4):
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheet-fetch")
+        self._lock = threading.Lock()
+        self._sheets = {}
+        self._inflight = {}
+        self._parsed = {}
+
+    def _submit(self, url, max_age):
+        """Future for a fetch of ``url``, joining one already in flight."""
+        with self._lock:
+            future = self._inflight.get(url)
+            if future is not None and not future.done():
+                return future
+            sheet = self._sheets.setdefault(url, Sheet(url))
+            if sheet.digest and time.time() - sheet.fetched_at < max_age:
+                future = Future()
+                future.set_result(sheet)
+                return future
+            future = self._pool.submit(self._fetch, sheet)
+            self._inflight[url] = future
+            return future
+
+    def _fetch(self, sheet):
+        headers = {}
+        if sheet.etag:
+            headers["If-None-Match"] = sheet.etag
+        if sheet.last_modified:
+            headers["If-Modified-Since"] = sheet.last_modified
+
+        response = self.session.get(sheet.url, headers=headers, timeout=self.timeout)
+        sheet.requests += 1
+        if response.status_code == 304 and sheet.digest:
+            sheet.not_modified += 1
+            sheet.changed = False
+            sheet.fetched_at = time.time()
+            return sheet
+        response.raise_for_status()
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        sheet.changed = digest != sheet.digest
+        sheet.body, sheet.digest = response.content, digest
+        sheet.etag = response.headers.get("ETag")
+        sheet.last_modified = response.headers.get("Last-Modified")
+        sheet.fetched_at = time.time()
+        return sheet
+
+    def fetch(self, url, max_age=0):
+        """Fetch ``url`` unless it was fetched less than ``max_age`` seconds ago.
+
+        Waits for a download of the same URL that is already in flight rather
+        than starting another.  Raises ``requests.RequestException`` on
+        network or HTTP errors; the previous body is kept in that case.
+        """
+        return self._submit(url, max_age).result()
+
+    def read_csv(self, url, max_age=0, **kwargs):
+        """``pd.read_csv`` over the fetched body, re-parsed only when it changed."""
+        sheet = self.fetch(url, max_age=max_age)
+        key = (url, repr(sorted(kwargs.items())))
+        with self._lock:
+            cached = self._parsed.get(key)
+        if cached is not None and cached[0] == sheet.digest:
+            return cached[1].copy()
+
+        df = pd.read_csv(io.BytesIO(sheet.body), **kwargs)
+        with self._lock:
+            self._parsed[key] = (sheet.digest, df)
+        return df.copy()
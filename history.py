@@ -0,0 +1,216 @@
+"""Append-only history of the roster, the open positions and the KPI cards.
+
+Each refresh appends only what changed since the previous one to a local
+SQLite database: a ``roster_events`` row per candidate field that changed
+(NULL when it was cleared or the candidate left the roster), a
+``job_events`` row per position whose number of openings changed, and a
+``kpi_values`` row per metric card whose value moved.  The latest state of
+both sheets is kept next to the events (``roster_state``, ``job_state``) so
+the next refresh is diffed against it, also across restarts.
+
+Trend queries read the indexed event tables, never old exports.  Writes
+are best-effort, like snapshots: a failure is logged, never raised.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from cohorts import OFFER_ACCEPTED
+from features import job_labels
+from snapshot import SNAPSHOT_DIR
+
+log = logging.getLogger(__name__)
+
+HISTORY_PATH = os.environ.get("DASHBOARD_HISTORY_PATH", os.path.join(SNAPSHOT_DIR, "history.sqlite"))
+
+# Roster fields whose changes are kept, per candidate (MIT Name).  Week is
+# derived from Start Date and today's date, so it is not.
+ROSTER_FIELDS = ["Status", "Cohort", "Training Site", "Location", "Level", "Salary", "VERT", "Start Date"]
+# A position is identified by its labels; identical rows count as openings
+JOB_KEY_FIELDS = ["Title", "Job Account", "City", "State"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roster_events (at REAL NOT NULL, name TEXT NOT NULL, field TEXT NOT NULL, value TEXT);
+CREATE INDEX IF NOT EXISTS roster_events_field ON roster_events (field, value, at);
+CREATE INDEX IF NOT EXISTS roster_events_name ON roster_events (name, field, at);
+CREATE TABLE IF NOT EXISTS roster_state (
+    name TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (name, field)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_events (at REAL NOT NULL, job TEXT NOT NULL, change INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS job_events_at ON job_events (at);
+CREATE TABLE IF NOT EXISTS job_state (job TEXT PRIMARY KEY, openings INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS kpi_values (at REAL NOT NULL, kpi TEXT NOT NULL, value INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS kpi_values_kpi ON kpi_values (kpi, at);
+"""
+
+# Monday of the week of a unix time, as 'YYYY-MM-DD'
+_WEEK = "date({}, 'unixepoch', '-6 days', 'weekday 1')"
+
+
+def _as_text(values):
+    """``values`` as strings (dates as YYYY-MM-DD), None where missing."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        text = values.dt.strftime("%Y-%m-%d")
+    else:
+        text = values.astype(str)
+    return text.astype(object).where(values.notna(), None)
+
+
+def roster_state(df, cohort):
+    """``(name, field, value)`` rows for the tracked fields of every named candidate."""
+    frame = df.assign(Cohort=cohort)
+    frame = frame[frame["MIT Name"].notna()].drop_duplicates("MIT Name", keep="last")
+    fields = [field for field in ROSTER_FIELDS if field in frame.columns]
+    values = np.column_stack([_as_text(frame[field]).to_numpy() for field in fields])
+    state = pd.DataFrame({
+        "name": np.repeat(frame["MIT Name"].astype(str).to_numpy(), len(fields)),
+        "field": np.tile(fields, len(frame)),
+        "value": values.ravel(),
+    })
+    return state[state["value"].notna()]
+
+
+def job_state(jobs_df):
+    """Openings per position key."""
+    labels = job_labels(jobs_df)[JOB_KEY_FIELDS].astype(str)
+    keys = labels.agg(" | ".join, axis=1)
+    return keys.value_counts().rename_axis("job").rename("openings").reset_index()
+
+
+class History:
+    """Appends refresh deltas to, and answers trend queries from, one SQLite file."""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.writes = 0  # records that appended rows; part of the key trend queries are cached under
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def record(self, df, cohort, jobs_df, kpi_values, at=None):
+        """Append what changed in the roster, jobs and KPI values; returns the counts appended."""
+        at = time.time() if at is None else at
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    counts = {
+                        "roster": self._record_roster(conn, roster_state(df, cohort), at),
+                        "jobs": self._record_jobs(conn, job_state(jobs_df), at),
+                        "kpis": self._record_kpis(conn, kpi_values, at),
+                    }
+                if any(counts.values()):
+                    self.writes += 1
+        except (OSError, sqlite3.Error):
+            log.warning("Could not record history", exc_info=True)
+            return None
+        return counts
+
+    def _record_roster(self, conn, new, at):
+        old = pd.DataFrame(
+            conn.execute("SELECT name, field, value FROM roster_state").fetchall(), columns=["name", "field", "value"]
+        )
+        both = old.merge(new, on=["name", "field"], how="outer", suffixes=("_old", ""))
+        # A state row always has a value, so a missing side is a change too
+        both = both.astype(object).where(both.notna(), None)
+        changed = both[both["value_old"].ne(both["value"])]
+        conn.executemany(
+            "INSERT INTO roster_events VALUES (?, ?, ?, ?)",
+            [(at, *row) for row in changed[["name", "field", "value"]].itertuples(index=False)],
+        )
+        kept = changed["value"].notna()
+        conn.executemany(
+            "INSERT OR REPLACE INTO roster_state VALUES (?, ?, ?)",
+            changed.loc[kept, ["name", "field", "value"]].itertuples(index=False),
+        )
+        conn.executemany(
+            "DELETE FROM roster_state WHERE name = ? AND field = ?",
+            changed.loc[~kept, ["name", "field"]].itertuples(index=False),
+        )
+        return len(changed)
+
+    def _record_jobs(self, conn, new, at):
+        old = pd.DataFrame(conn.execute("SELECT job, openings FROM job_state").fetchall(), columns=["job", "openings"])
+        both = old.merge(new, on="job", how="outer", suffixes=("_old", "")).fillna({"openings_old": 0, "openings": 0})
+        change = (both["openings"] - both["openings_old"]).astype(int)
+        changed = both.assign(change=change)[change != 0]
+        conn.executemany(
+            "INSERT INTO job_events VALUES (?, ?, ?)",
+            [(at, job, int(change)) for job, change in changed[["job", "change"]].itertuples(index=False)],
+        )
+        open_now = changed["openings"] > 0
+        conn.executemany(
+            "INSERT OR REPLACE INTO job_state VALUES (?, ?)",
+            [(job, int(n)) for job, n in changed.loc[open_now, ["job", "openings"]].itertuples(index=False)],
+        )
+        conn.executemany("DELETE FROM job_state WHERE job = ?", [(job,) for job in changed.loc[~open_now, "job"]])
+        return len(changed)
+
+    def _record_kpis(self, conn, kpi_values, at):
+        # SQLite returns the value of the row holding MAX(at) for each group
+        latest = dict(
+            (kpi, value) for kpi, value, _ in
+            conn.execute("SELECT kpi, value, MAX(at) FROM kpi_values GROUP BY kpi").fetchall()
+        )
+        moved = [(at, kpi, int(value)) for kpi, value in kpi_values.items() if latest.get(kpi) != int(value)]
+        conn.executemany("INSERT INTO kpi_values VALUES (?, ?, ?)", moved)
+        return len(moved)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(sql, params)
+            return pd.DataFrame(cursor.fetchall(), columns=[c[0] for c in cursor.description])
+
+    def kpi_trend(self):
+        """KPI values at the end of each week (rows: week starting Monday, columns: KPIs)."""
+        values = self._query(
+            f"SELECT kpi, {_WEEK.format('at')} AS week, value, MAX(at) FROM kpi_values GROUP BY kpi, week"
+        )
+        if values.empty:
+            return pd.DataFrame()
+        trend = values.pivot(index="week", columns="kpi", values="value")
+        trend.index = pd.to_datetime(trend.index)
+        # Weeks without a change keep the previous week's value
+        weeks = pd.date_range(trend.index.min(), trend.index.max(), freq="W-MON")
+        return trend.reindex(weeks).ffill().rename_axis("week").rename_axis(None, axis=1)
+
+    def time_to_placement(self):
+        """Placements seen happening, per week: count and median days from start date to offer accepted.
+
+        Candidates already placed when first recorded are left out, since
+        when they were placed is unknown.
+        """
+        placed = self._query(
+            f"""
+            SELECT {_WEEK.format('p.placed_at')} AS week,
+                   julianday(p.placed_at, 'unixepoch') - julianday(
+                       (SELECT value FROM roster_events s
+                        WHERE s.name = p.name AND s.field = 'Start Date' AND s.value IS NOT NULL
+                        ORDER BY s.at DESC LIMIT 1)
+                   ) AS days
+            FROM (SELECT name, MIN(at) AS placed_at FROM roster_events
+                  WHERE field = 'Cohort' AND value = ? GROUP BY name) p
+            WHERE EXISTS (SELECT 1 FROM roster_events e
+                          WHERE e.name = p.name AND e.field = 'Cohort' AND e.at < p.placed_at)
+            """,
+            (OFFER_ACCEPTED,),
+        )
+        if placed.empty:
+            return pd.DataFrame(columns=["placements", "median days"])
+        placed["week"] = pd.to_datetime(placed["week"])
+        return placed.groupby("week")["days"].agg(placements="size", **{"median days": "median"})
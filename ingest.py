@@ -0,0 +1,210 @@
+"""Schema-driven cleaning of the raw roster and placement-options sheets.
+
+Every parser here works on whole columns: Week comes from date arithmetic
+on Start Date, and salaries are parsed with one regex ``str.extract`` pass.
+The cleaned frames carry the dtypes in ``ROSTER_SCHEMA`` / ``JOBS_SCHEMA``,
+which the rest of the dashboard relies on as-is.
+
+``ROSTER_READ_OPTIONS`` prunes the roster to the columns in
+``ROSTER_COLUMNS`` at parse time; ``JOBS_READ_OPTIONS`` only declares the
+``JOBS_COLUMNS`` dtypes, because the Open Job Positions table shows every
+jobs column.  ``clean_chunks`` cleans a large export one chunk at a time.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+ROSTER_RENAMES = {"Week ": "Week", "Start date": "Start Date"}
+JOBS_DROP = ["JV Link", "JV ID"]
+
+SALARY_PARTS = ["Salary Low", "Salary High", "Salary Mid"]
+
+# Roster columns whose name contains one of these hold prior experience notes
+EXPERIENCE_KEYWORDS = ["experience", "notes", "background"]
+
+# Raw columns the dashboard uses (under any of their spellings), with the
+# dtype each one is parsed as; everything else is skipped by read_options()
+ROSTER_COLUMNS = {
+    "MIT Name": "str",
+    "Training Site": "str",
+    "Location": "str",
+    "Week": "str",
+    "Start date": "str",
+    "Start Date": "str",
+    "Salary": "str",
+    "Level": "str",
+    "Status": "category",
+    "VERT": "category",
+    "Confidence": "str",
+}
+JOBS_COLUMNS = {
+    "Job Title": "str",
+    "Title": "str",
+    "Account": "str",
+    "Job Account": "str",
+    "City": "str",
+    "State": "category",
+    "VERT": "category",
+    "Vertical": "category",
+    "Salary": "str",
+}
+
+# Columns every cleaned frame is conformed to; missing columns are skipped
+ROSTER_SCHEMA = {
+    "Start Date": "datetime64[ns]",
+    "Week": "Float64",
+    "Salary": "float32",
+    "Salary Low": "float32",
+    "Salary High": "float32",
+    "Salary Mid": "float32",
+    "Status": "category",
+    "VERT": "category",
+}
+JOBS_SCHEMA = {
+    "Salary Low": "float32",
+    "Salary High": "float32",
+    "Salary Mid": "float32",
+    "State": "category",
+    "VERT": "category",
+}
+
+# "$65,000.00", "70k-75k", "$70,000 – $75,000", "65000"
+_AMOUNT = r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*(k?)"
+SALARY_PATTERN = rf"^\s*{_AMOUNT}\s*(?:[-–—_]\s*{_AMOUNT})?\s*$"
+
+
+# ---- Reading ----
+
+def read_options(columns, keywords=(), prune=True):
+    """``usecols`` and ``dtype`` for ``pd.read_csv`` that keep only ``columns``.
+
+    Header names are matched with surrounding whitespace stripped, so
+    "Week " counts as "Week".  Columns whose name contains one of
+    ``keywords`` are kept too, as plain strings.  With ``prune=False`` every
+    column is kept and only the dtypes of ``columns`` are declared.
+    """
+    wanted = set(columns)
+
+    def usecols(name):
+        name = str(name).strip()
+        return name in wanted or any(k in name.lower() for k in keywords)
+
+    dtype = {**columns, **{f"{name} ": kind for name, kind in columns.items()}}
+    if not prune:
+        return {"dtype": dtype}
+    return {"usecols": usecols, "dtype": dtype}
+
+
+# Built once, so parse caches keyed on read_csv options see the same usecols
+ROSTER_READ_OPTIONS = read_options(ROSTER_COLUMNS, EXPERIENCE_KEYWORDS)
+JOBS_READ_OPTIONS = read_options(JOBS_COLUMNS, prune=False)
+
+
+def concat_chunks(frames):
+    """Concatenate cleaned chunks, keeping categorical columns categorical."""
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0]
+    first = frames[0]
+    categorical = [c for c in first.columns if isinstance(first[c].dtype, pd.CategoricalDtype)]
+    df = pd.concat([f.drop(columns=categorical) for f in frames])
+    for col in categorical:
+        df[col] = pd.Series(union_categoricals([f[col] for f in frames]), index=df.index)
+    return df[first.columns]
+
+
+def clean_chunks(chunks, clean, **kwargs):
+    """``clean`` applied to each raw chunk of a chunked ``read_csv``, then concatenated."""
+    return concat_chunks(clean(chunk, **kwargs) for chunk in chunks)
+
+
+# ---- Parsers ----
+
+def _amount(number, thousands):
+    value = pd.to_numeric(number.str.replace(",", "", regex=False), errors="coerce")
+    return value.where(thousands.fillna("") == "", value * 1000)
+
+
+def parse_salaries(values):
+    """Low, high and midpoint of each salary value as float32 columns.
+
+    A single amount has low == high == mid; anything unparseable is NaN.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        amount = values.astype("float32")
+        return pd.DataFrame({"Salary Low": amount, "Salary High": amount, "Salary Mid": amount})
+
+    parts = values.astype("string").str.lower().str.extract(SALARY_PATTERN)
+    low = _amount(parts[0], parts[1])
+    high = _amount(parts[2], parts[3]).fillna(low)
+    return pd.DataFrame({
+        "Salary Low": low.to_numpy(dtype="float32", na_value=np.nan),
+        "Salary High": high.to_numpy(dtype="float32", na_value=np.nan),
+        "Salary Mid": ((low + high) / 2).to_numpy(dtype="float32", na_value=np.nan),
+    }, index=values.index)
+
+
+def weeks_in_program(start, manual=None, today=None):
+    """Program week per row: 1 during the first 7 days after Start Date.
+
+    Manual ``Week`` entries win and are kept as entered, so "6.5" stays past
+    week 6 (Ready) as it always was; future or missing start dates give <NA>.
+    """
+    today = pd.Timestamp.now() if today is None else pd.Timestamp(today)
+    days = (today - start).dt.days
+    weeks = (days // 7 + 1).where(start <= today)
+    if manual is not None:
+        weeks = pd.to_numeric(manual, errors="coerce").fillna(weeks)
+    return weeks.astype("Float64")
+
+
+def _conform(df, schema):
+    for col, dtype in schema.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+# ---- Cleaning ----
+
+def clean_roster(df, today=None):
+    """Typed roster frame from the raw Active Roster sheet."""
+    df = df.dropna(how="all")
+    df.columns = [c.strip() if isinstance(c, str) else c for c in df.columns]
+    df = df.rename(columns=ROSTER_RENAMES)
+
+    # Remove rows without names
+    df = df[df["MIT Name"].notna() & (df["MIT Name"] != "")].copy()
+
+    if "Start Date" in df.columns:
+        df["Start Date"] = pd.to_datetime(df["Start Date"], errors="coerce")
+        df["Week"] = weeks_in_program(df["Start Date"], df.get("Week"), today)
+    elif "Week" in df.columns:
+        df["Week"] = pd.to_numeric(df["Week"], errors="coerce").astype("Float64")
+
+    if "Salary" in df.columns:
+        salary = parse_salaries(df["Salary"])
+        df[SALARY_PARTS] = salary
+        df["Salary"] = salary["Salary Mid"]
+
+    df["Status"] = df["Status"].astype(str).str.strip().str.lower()
+    return _conform(df, ROSTER_SCHEMA)
+
+
+def clean_jobs(jobs_df):
+    """Jobs frame from the raw Placement Options sheet, with parsed salary columns."""
+    jobs_df = jobs_df.loc[:, ~jobs_df.columns.str.contains("^Unnamed")]
+    jobs_df = jobs_df.drop(columns=[c for c in JOBS_DROP if c in jobs_df.columns])
+    jobs_df = jobs_df.dropna(how="all")
+    for col in jobs_df.select_dtypes("category").columns:
+        if "" not in jobs_df[col].cat.categories:
+            jobs_df[col] = jobs_df[col].cat.add_categories("")
+    jobs_df = jobs_df.fillna("")
+
+    # Remove rows without a job title
+    jobs_df = jobs_df[jobs_df["Job Title"].notna() & (jobs_df["Job Title"] != "")].copy()
+
+    if "Salary" in jobs_df.columns:
+        jobs_df[SALARY_PARTS] = parse_salaries(jobs_df["Salary"])
+    return _conform(jobs_df, JOBS_SCHEMA)
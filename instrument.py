@@ -0,0 +1,200 @@
+"""Per-run stage timings and cache hit counts for the dashboard.
+
+A ``Run`` collects every ``stage`` entered while it is current (fetch,
+parse, clean, score, render, ...) with its wall time and how far it raised
+the process's peak resident memory, plus named milestones such as the
+time to the first metric card (``mark``).  ``track_cache`` wraps an
+``st.cache_data`` loader and counts hits and misses per process.  Each
+stage, and each finished run, is also logged as one JSON line on the
+``dashboard.metrics`` logger.
+"""
+import contextvars
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = logging.getLogger("dashboard.metrics")
+
+_current = contextvars.ContextVar("dashboard_run", default=None)
+_cache_lock = threading.Lock()
+_cache_counts = {}
+_local = threading.local()
+
+
+def log_to_stderr(level=logging.INFO):
+    """Send metric lines to stderr as bare JSON, unless a handler is already set up."""
+    if log.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(level)
+    log.propagate = False
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10, 1)
+
+
+def _emit(record):
+    log.info(json.dumps(record, default=str))
+
+
+# ---- Runs and stages ----
+
+class Run:
+    """Stage timings and cache results for one script run (or one CLI run)."""
+
+    def __init__(self, name="dashboard"):
+        self.name = name
+        self.stages = []
+        self.marks = {}
+        self.cache = {}
+        self.started = time.perf_counter()
+        self.seconds = None
+        self._token = None
+
+    def start(self):
+        """Make this the run that ``stage`` and ``track_cache`` record into."""
+        self._token = _current.set(self)
+        return self
+
+    def finish(self):
+        """Stop recording and log the run summary."""
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        self.seconds = round(time.perf_counter() - self.started, 4)
+        _emit({
+            "event": "run",
+            "run": self.name,
+            "seconds": self.seconds,
+            "stages": {s["stage"]: s["seconds"] for s in self.stages},
+            "marks": self.marks,
+            "cache": self.cache,
+            "peak_rss_mb": peak_rss_mb(),
+        })
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.finish()
+
+    def mark(self, name):
+        """Record the seconds from the run's start to now as milestone ``name`` (first call wins)."""
+        self.marks.setdefault(name, round(time.perf_counter() - self.started, 4))
+
+    def totals(self):
+        """Seconds per stage name, summed over repeats (e.g. both sheets' "parse")."""
+        totals = {}
+        for s in self.stages:
+            totals[s["stage"]] = totals.get(s["stage"], 0.0) + s["seconds"]
+        return totals
+
+
+def current_run():
+    return _current.get()
+
+
+class Stage:
+    """Times one stage; use as a context manager or ``start()`` / ``stop()``."""
+
+    def __init__(self, name, detail=None):
+        self.name = name
+        self.detail = detail
+        self._start = None
+        self._peak = None
+
+    def start(self):
+        self._peak = peak_rss_mb()
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        # The peak only ever rises, so the stage's own share is how far it pushed it
+        peak = peak_rss_mb()
+        record = {
+            "stage": self.name,
+            "detail": self.detail,
+            "seconds": round(time.perf_counter() - self._start, 4),
+            "peak_rss_growth_mb": None if peak is None else round(peak - self._peak, 1),
+        }
+        run = current_run()
+        if run is not None:
+            run.stages.append(record)
+        _emit({"event": "stage", "run": run.name if run else None, **record})
+        return record
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def stage(name, detail=None):
+    return Stage(name, detail)
+
+
+def mark(name):
+    """``Run.mark`` on the current run, if any."""
+    run = current_run()
+    if run is not None:
+        run.mark(name)
+
+
+# ---- Cache hits ----
+
+def track_cache(name, cache):
+    """Decorator applying ``cache`` (e.g. ``st.cache_data(ttl=60)``) and counting hits.
+
+    A call is a miss when the wrapped function body actually ran.  The
+    returned function keeps the cached function's ``clear``.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _local.missed = True
+            return func(*args, **kwargs)
+
+        cached = cache(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            _local.missed = False
+            result = cached(*args, **kwargs)
+            record_cache(name, hit=not _local.missed)
+            return result
+
+        call.clear = cached.clear
+        return call
+    return decorate
+
+
+def record_cache(name, hit):
+    with _cache_lock:
+        counts = _cache_counts.setdefault(name, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+    run = current_run()
+    if run is not None:
+        run.cache[name] = "hit" if hit else "miss"
+
+
+def cache_counts():
+    """Process-wide hits and misses per tracked cache."""
+    with _cache_lock:
+        return {name: dict(counts) for name, counts in _cache_counts.items()}
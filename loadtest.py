@@ -0,0 +1,157 @@
+"""Concurrent-viewer load test for the dashboard.
+
+Serves synthetic sheets (see ``synthetic.py``) from a local HTTP server,
+then opens ``--sessions`` fresh sessions of ``app.py`` at the same moment
+with Streamlit's ``AppTest``, ``--rounds`` times over.  Each session is a
+full script run, like a new viewer opening the page; the sessions share one
+process, so they share the refreshers and the result cache as viewers of
+one server would.  Reports render latency and time to the first metric card
+(p50/p95) per round and overall, and the hits and misses of every tracked
+cache::
+
+    python loadtest.py --sessions 8 --rounds 3 --candidates 2000 --jobs 2000
+
+The first round also waits for the first sheet load.
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from instrument import cache_counts
+from synthetic import write_sheets
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class RunCollector(logging.Handler):
+    """Keeps the dashboard's per-run summaries from the ``dashboard.metrics`` logger."""
+
+    def __init__(self):
+        super().__init__()
+        self.runs = []
+
+    def emit(self, record):
+        event = json.loads(record.getMessage())
+        if event.get("event") == "run" and event.get("run") == "dashboard":
+            self.runs.append(event)
+
+
+def serve_directory(directory):
+    """Start a local HTTP server for ``directory``; returns (server, base URL)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, name="loadtest-http", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_session(barrier, timeout):
+    """One fresh session's script run: (seconds, error or None)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    barrier.wait()
+    start = time.perf_counter()
+    try:
+        at.run()
+    except Exception as e:
+        return time.perf_counter() - start, repr(e)
+    seconds = time.perf_counter() - start
+    if at.exception:
+        return seconds, at.exception[0].message
+    return seconds, None
+
+
+def run_round(sessions, timeout):
+    """Run ``sessions`` sessions at once; returns their (seconds, error) results."""
+    barrier = threading.Barrier(sessions)
+    results = [None] * sessions
+
+    def target(i):
+        results[i] = run_session(barrier, timeout)
+
+    threads = [threading.Thread(target=target, args=(i,), name=f"viewer-{i}") for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _percentile(values, q):
+    return round(float(np.percentile(values, q)), 3) if len(values) else None
+
+
+def summarize(label, results, runs):
+    seconds = np.array([s for s, _ in results])
+    first_metric = np.array([r["marks"]["first_metric"] for r in runs if "first_metric" in r["marks"]])
+    return {
+        "round": label,
+        "sessions": len(results),
+        "errors": sum(error is not None for _, error in results),
+        "p50 s": _percentile(seconds, 50),
+        "p95 s": _percentile(seconds, 95),
+        "max s": round(float(seconds.max()), 3),
+        "first metric p50 s": _percentile(first_metric, 50),
+        "first metric p95 s": _percentile(first_metric, 95),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render latency of concurrent dashboard sessions.")
+    parser.add_argument("--sessions", type=int, default=8, help="sessions opened at the same moment")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--candidates", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per session run")
+    args = parser.parse_args(argv)
+
+    # Collect the per-run summaries instead of printing them
+    collector = RunCollector()
+    metrics_log = logging.getLogger("dashboard.metrics")
+    metrics_log.addHandler(collector)
+    metrics_log.setLevel(logging.INFO)
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as tmp:
+        write_sheets(tmp, args.candidates, args.jobs)
+        server, base = serve_directory(tmp)
+        os.environ["ROSTER_CSV_URL"] = f"{base}/roster.csv"
+        os.environ["JOBS_CSV_URL"] = f"{base}/jobs.csv"
+        # Keep the load test's data out of the real snapshot directory
+        os.environ["DASHBOARD_SNAPSHOT_DIR"] = os.path.join(tmp, "snapshots")
+
+        rows, errors, every = [], [], []
+        for i in range(1, args.rounds + 1):
+            print(f"Round {i}: {args.sessions} sessions...", file=sys.stderr)
+            first_run = len(collector.runs)
+            results = run_round(args.sessions, args.timeout)
+            rows.append(summarize("1 (cold)" if i == 1 else str(i), results, collector.runs[first_run:]))
+            errors += [error for _, error in results if error is not None]
+            every += results
+        server.shutdown()
+
+    rows.append(summarize("all", every, collector.runs))
+    print(pd.DataFrame(rows).to_string(index=False))
+    counts = pd.DataFrame([{"cache": name, **c} for name, c in cache_counts().items()])
+    if not counts.empty:
+        print(counts.to_string(index=False))
+    for error in sorted(set(errors)):
+        print(f"ERROR {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
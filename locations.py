@@ -0,0 +1,133 @@
+"""Canonical locations and coordinates for geo scoring.
+
+Roster Location ("Seattle, WA", "seattle", "Tacoma WA", "Dallas, Texas")
+and job City/State are resolved against the bundled offline gazetteer,
+``gazetteer.csv`` (US cities with their state and coordinates), to a
+canonical ``"city, st"`` key, a state abbreviation and a position.  Only
+distinct strings are parsed, once per data refresh; scoring then compares
+integer codes and coordinates, never strings.
+
+A city without a state ("Seattle") resolves to the first gazetteer entry
+with that name, so the file lists larger cities first; a bare name that is
+also a state ("New York", "Washington") is read as the city.  Places
+missing from the gazetteer keep their key and state but get no coordinates.
+"""
+import functools
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.csv")
+EARTH_RADIUS_MILES = 3958.8
+
+US_STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
+    "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware", "DC": "District of Columbia",
+    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois",
+    "IN": "Indiana", "IA": "Iowa", "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana",
+    "ME": "Maine", "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
+    "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma", "OR": "Oregon",
+    "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota",
+    "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont", "VA": "Virginia",
+    "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
+}
+_STATE_LOOKUP = {
+    **{abbr.lower(): abbr for abbr in US_STATES},
+    **{name.lower(): abbr for abbr, name in US_STATES.items()},
+}
+_MISSING = {"", "nan", "none", "<na>", "n/a", "—"}
+
+LOCATION_COLUMNS = ["loc_key", "loc_state", "lat", "lon"]
+
+
+def _state(text):
+    """State abbreviation for an abbreviation or full state name, else None."""
+    return _STATE_LOOKUP.get(text.strip(" ."))
+
+
+def parse_location(text, cities=()):
+    """``(city, state)`` from free text, lower-cased city and upper-case state; either may be None.
+
+    Bare text found in ``cities`` (lower-cased names) is a city even when it
+    also names a state, so "New York" and "Washington" keep their city.
+    """
+    text = re.sub(r"\s+", " ", str(text).strip().lower()).strip(" .,")
+    if text in _MISSING:
+        return None, None
+    if "," in text:
+        city, _, rest = text.rpartition(",")
+        if rest.strip() in _MISSING:  # "Seattle, nan" from a blank State cell
+            return parse_location(city, cities)
+        state = _state(rest)
+        if state is not None:
+            city = city.strip(" .,")
+            return (None if city in _MISSING else city), state
+        return text, None
+    if text in cities:
+        return text, None
+    if _state(text) is not None:
+        return None, _state(text)
+    # "tacoma wa", "salem new hampshire": longest state name at the end wins
+    words = text.split(" ")
+    for n in range(min(3, len(words) - 1), 0, -1):
+        state = _state(" ".join(words[-n:]))
+        if state is not None:
+            return " ".join(words[:-n]), state
+    return text, None
+
+
+class LocationIndex:
+    """Gazetteer lookups from location text to key, state and coordinates."""
+
+    def __init__(self, path=GAZETTEER_PATH):
+        gazetteer = pd.read_csv(path, dtype={"city": str, "state": str})
+        cities = gazetteer["city"].str.lower()
+        keys = cities + ", " + gazetteer["state"].str.lower()
+        self.positions = dict(zip(keys, zip(gazetteer["lat"], gazetteer["lon"])))
+        # First entry per name, for text that gives no state
+        self.states = dict(zip(cities[::-1], gazetteer["state"][::-1]))
+
+    def lookup(self, text):
+        """``(key, state, lat, lon)`` for one location string; missing parts are None/NaN."""
+        city, state = parse_location(text, self.states)
+        if city is None:
+            return None, state, np.nan, np.nan
+        if state is None:
+            state = self.states.get(city)
+            if state is None:
+                return city, None, np.nan, np.nan
+        key = f"{city}, {state.lower()}"
+        lat, lon = self.positions.get(key, (np.nan, np.nan))
+        return key, state, lat, lon
+
+    def resolve(self, texts):
+        """``LOCATION_COLUMNS`` for a Series of location strings, parsing each distinct value once."""
+        codes, uniques = pd.factorize(texts, use_na_sentinel=False)
+        found = pd.DataFrame([self.lookup(text) for text in uniques], columns=LOCATION_COLUMNS)
+        found = found.astype({"loc_key": object, "loc_state": object, "lat": float, "lon": float})
+        return found.iloc[codes].set_axis(texts.index)
+
+
+@functools.lru_cache(maxsize=1)
+def default_index():
+    """The bundled gazetteer's index, loaded once per process."""
+    return LocationIndex()
+
+
+def unit_vectors(lat, lon):
+    """(n, 3) points on the unit sphere; NaN where the coordinates are unknown."""
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def within_miles(miles):
+    """Smallest dot product of two ``unit_vectors`` rows that are at most ``miles`` apart.
+
+    Comparing dot products against this is the same test as comparing the
+    haversine distance against ``miles``, without any trigonometry per pair.
+    """
+    return np.cos(miles / EARTH_RADIUS_MILES)
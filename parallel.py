@@ -0,0 +1,87 @@
+"""Top-k match scoring split across a process pool.
+
+Candidates are cut into blocks, and each worker process scores its blocks
+against every job.  The encoded job arrays are written once to ``.npy``
+files that every worker memory-maps read-only, so the OS page cache shares
+one copy of them instead of pickling them into each task.  Only a block's
+candidate rows go out with a task, and only its top ``k`` rows come back.
+
+Small inputs never pay the pool start-up cost: below ``PARALLEL_MIN_CELLS``
+matrix cells, or with a single usable CPU, this is ``scoring.top_matches``.
+"""
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scoring import block_rows, encode_features, score_block, slice_rows, top_matches
+
+PARALLEL_MIN_CELLS = 20_000_000  # below this, one process wins after pool start-up
+CELLS_PER_WORKER = 10_000_000  # don't start a worker for less work than this
+MAX_WORKERS = 8
+
+_job_arrays = None  # set in each worker by _load_jobs
+
+
+def usable_cpus():
+    """CPUs this process may run on (respects affinity masks and containers)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def auto_workers(n_cells):
+    """Worker processes worth starting for a matrix of ``n_cells`` cells; 1 means serial."""
+    if n_cells < PARALLEL_MIN_CELLS:
+        return 1
+    return max(1, min(usable_cpus(), MAX_WORKERS, n_cells // CELLS_PER_WORKER))
+
+
+def _save_arrays(arrays, directory):
+    paths = {}
+    for name, values in arrays.items():
+        paths[name] = os.path.join(directory, f"{name}.npy")
+        np.save(paths[name], values)
+    return paths
+
+
+def _load_jobs(paths):
+    global _job_arrays
+    _job_arrays = {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+
+
+def _score_block(c, k, weights, offset):
+    return score_block(c, _job_arrays, k, weights, offset=offset)
+
+
+def top_matches_parallel(cand, jobs, k=3, weights=None, workers=None, block_cells=1_000_000):
+    """``scoring.top_matches`` computed on ``workers`` processes.
+
+    ``workers=None`` picks a count from the matrix size and the CPUs
+    available (see ``auto_workers``); 1 scores in this process.  Results are
+    identical to ``top_matches`` whatever the worker count.
+    """
+    n_cells = len(cand) * len(jobs)
+    workers = auto_workers(n_cells) if workers is None else workers
+    if workers <= 1 or not n_cells:
+        return top_matches(cand, jobs, k, weights, block_cells)
+
+    c, j = encode_features(cand, jobs)
+    # Several blocks per worker keeps them all busy until the end
+    block = min(block_rows(len(jobs), block_cells), max(1, -(-len(cand) // (workers * 4))))
+    starts = range(0, len(cand), block)
+
+    # Spawned (not forked) workers: the dashboard process runs other threads
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="match-jobs-") as tmp:
+        paths = _save_arrays(j, tmp)
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_load_jobs, initargs=(paths,)) as pool:
+            futures = [
+                pool.submit(_score_block, slice_rows(c, start, start + block), k, weights, start)
+                for start in starts
+            ]
+            frames = [future.result() for future in futures]
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,215 @@
+"""Load, clean and score the dashboard data outside of Streamlit.
+
+The dashboard and the batch CLI share these functions.  Run the CLI as::
+
+    python pipeline.py --roster roster.csv --jobs jobs.csv --out artifact/
+
+Either source may be a URL or a local CSV export of the sheet.  The
+artifact directory gets the cleaned ``roster.parquet`` (with its Cohort
+column), ``jobs.parquet``, the per-candidate top ``matches.parquet``
+(candidate and job positions with scores; labels come from the jobs) and
+``metrics.json``.  Point ``DASHBOARD_ARTIFACT`` at it and the dashboard
+renders from those files instead of computing anything.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from checkpoints import content_key
+from cohorts import MATCH_COHORTS, assign_cohorts, cohort_frame, kpis
+from features import candidate_features, job_features, job_labels
+from fetch import SheetFetcher
+from ingest import JOBS_READ_OPTIONS, ROSTER_READ_OPTIONS, clean_chunks, clean_jobs, clean_roster
+from instrument import Run, log_to_stderr, stage
+from parallel import top_matches_parallel
+from scoring import DEFAULT_WEIGHTS
+from snapshot import arrow_safe
+
+ROSTER_CSV_OPTIONS = {"skiprows": 1}  # Skip header row
+JOBS_CSV_OPTIONS = {"skiprows": 5, "header": 0}  # Skip to data rows
+
+ARTIFACT_FILES = {
+    "roster": "roster.parquet",
+    "jobs": "jobs.parquet",
+    "matches": "matches.parquet",
+    "metrics": "metrics.json",
+}
+
+
+# ---- Load ----
+
+def is_url(source):
+    return str(source).startswith(("http://", "https://"))
+
+
+def read_sheet(source, fetcher=None, max_age=0, label=None, **kwargs):
+    """Raw sheet from a URL (through ``fetcher``) or a local CSV file.
+
+    With ``chunksize`` in ``kwargs`` this returns ``read_csv``'s chunk
+    iterator instead of a frame, and parsing happens as it is consumed.
+    """
+    if not is_url(source):
+        with stage("parse", label):
+            return pd.read_csv(source, **kwargs)
+    fetcher = fetcher or SheetFetcher()
+    with stage("fetch", label):
+        sheet = fetcher.fetch(source, max_age=max_age)
+    if kwargs.get("chunksize"):
+        return pd.read_csv(io.BytesIO(sheet.body), **kwargs)
+    with stage("parse", label):
+        return fetcher.read_csv(source, max_age=max_age, **kwargs)
+
+
+def _load(source, fetcher, max_age, label, options, clean, chunksize, checkpoints=None, **clean_kwargs):
+    if checkpoints is not None and is_url(source) and not chunksize:
+        # Same bytes, options and clean arguments: reuse the cleaned frame
+        fetcher = fetcher or SheetFetcher()
+        with stage("fetch", label):
+            sheet = fetcher.fetch(source, max_age=max_age)
+        key = content_key(sheet.digest, sorted(options.items()), sorted(clean_kwargs.items()))
+
+        def parse_and_clean():
+            with stage("parse", label):
+                raw = pd.read_csv(io.BytesIO(sheet.body), **options)
+            with stage("clean", label):
+                return clean(raw, **clean_kwargs)
+
+        return checkpoints.get(label, key, parse_and_clean)
+    if chunksize:
+        chunks = read_sheet(source, fetcher, max_age, label, chunksize=chunksize, **options)
+        with stage("parse+clean", f"{label}, {chunksize}-row chunks"):
+            return clean_chunks(chunks, clean, **clean_kwargs)
+    raw = read_sheet(source, fetcher, max_age, label, **options)
+    with stage("clean", label):
+        return clean(raw, **clean_kwargs)
+
+
+def load_roster(source, fetcher=None, max_age=0, today=None, pruned=True, chunksize=None, checkpoints=None):
+    """Cleaned roster from a URL or file.
+
+    ``pruned`` parses only the columns in ``ingest.ROSTER_COLUMNS``, with
+    their declared dtypes (for the jobs, every column with the
+    ``ingest.JOBS_COLUMNS`` dtypes); ``chunksize`` parses and cleans that many rows at
+    a time, which bounds the raw text held in memory for large exports.
+    With ``checkpoints`` (a ``checkpoints.Checkpoints``), a URL whose bytes
+    are unchanged since the last load on the same day returns the same
+    frame without parsing or cleaning.
+    """
+    options = {**ROSTER_CSV_OPTIONS, **(ROSTER_READ_OPTIONS if pruned else {})}
+    # Week counts whole days, so the date is all of "today" that matters
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    return _load(source, fetcher, max_age, "roster", options, clean_roster, chunksize, checkpoints, today=today)
+
+
+def load_jobs(source, fetcher=None, max_age=0, pruned=True, chunksize=None, checkpoints=None):
+    """Cleaned jobs from a URL or file; see ``load_roster`` for the options."""
+    options = {**JOBS_CSV_OPTIONS, **(JOBS_READ_OPTIONS if pruned else {})}
+    return _load(source, fetcher, max_age, "jobs", options, clean_jobs, chunksize, checkpoints)
+
+
+# ---- Compute ----
+
+def match_candidates(df, cohort):
+    """Roster rows that get job matches: active candidates with a name."""
+    return cohort_frame(df, cohort, MATCH_COHORTS).dropna(subset=["MIT Name"])
+
+
+def label_matches(top_df, jobs_df):
+    """Join display labels onto top-k rows by job position.
+
+    Labels are built only for the jobs ``top_df`` refers to, so labelling
+    the page being shown costs the same however many matches there are.
+    """
+    jobs = np.unique(top_df["job"].to_numpy())
+    return top_df.join(job_labels(jobs_df.iloc[jobs]).set_axis(jobs), on="job")
+
+
+def compute(df, jobs_df, k=3, weights=None, workers=None):
+    """Cohorts, KPI values and top-``k`` matches for one data load.
+
+    Match ``candidate`` positions index into ``match_candidates(df, cohort)``
+    and ``job`` positions into ``jobs_df``; see ``label_matches``.
+    ``workers`` is the scoring process count; None picks one from the input
+    size (see ``parallel.auto_workers``).
+    """
+    with stage("kpis"):
+        cohort = assign_cohorts(df)
+        metrics = kpis(cohort, jobs_df)
+    with stage("score"):
+        candidates_df = match_candidates(df, cohort)
+        matches = top_matches_parallel(
+            candidate_features(candidates_df), job_features(jobs_df), k=k, weights=weights, workers=workers
+        )
+    return {
+        "cohort": cohort,
+        "metrics": metrics,
+        "candidates": candidates_df,
+        "matches": matches,
+    }
+
+
+# ---- Artifact ----
+
+def write_artifact(out_dir, df, jobs_df, result, meta=None):
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {name: os.path.join(out_dir, file) for name, file in ARTIFACT_FILES.items()}
+    arrow_safe(df.assign(Cohort=result["cohort"])).to_parquet(paths["roster"], index=False)
+    arrow_safe(jobs_df).to_parquet(paths["jobs"], index=False)
+    arrow_safe(result["matches"]).to_parquet(paths["matches"], index=False)
+    with open(paths["metrics"], "w", encoding="utf-8") as f:
+        json.dump({"metrics": result["metrics"], **(meta or {})}, f, indent=2, ensure_ascii=False)
+    return paths
+
+
+def read_artifact(path):
+    """The artifact written by ``write_artifact``, as frames plus metadata."""
+    paths = {name: os.path.join(path, file) for name, file in ARTIFACT_FILES.items()}
+    with open(paths["metrics"], encoding="utf-8") as f:
+        meta = json.load(f)
+    return {
+        "roster": pd.read_parquet(paths["roster"]),
+        "jobs": pd.read_parquet(paths["jobs"]),
+        "matches": pd.read_parquet(paths["matches"]),
+        "metrics": meta.pop("metrics"),
+        "meta": meta,
+    }
+
+
+# ---- CLI ----
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute dashboard metrics and top matches without Streamlit.")
+    parser.add_argument("--roster", required=True, help="Active Roster CSV (URL or file)")
+    parser.add_argument("--jobs", required=True, help="Placement Options CSV (URL or file)")
+    parser.add_argument("--out", required=True, help="Artifact directory to write")
+    parser.add_argument("--top-k", type=int, default=3, help="Matches kept per candidate (default 3)")
+    parser.add_argument("--all-columns", action="store_true", help="Parse every sheet column, not just the used ones")
+    parser.add_argument("--chunksize", type=int, help="Parse and clean the CSVs this many rows at a time")
+    parser.add_argument("--workers", type=int, help="Scoring processes (default: chosen from the input size)")
+    args = parser.parse_args(argv)
+
+    log_to_stderr()
+    with Run("pipeline") as run:
+        fetcher = SheetFetcher()
+        ingest = {"pruned": not args.all_columns, "chunksize": args.chunksize}
+        df = load_roster(args.roster, fetcher, **ingest)
+        jobs_df = load_jobs(args.jobs, fetcher, **ingest)
+        result = compute(df, jobs_df, k=args.top_k, workers=args.workers)
+        with stage("write"):
+            write_artifact(args.out, df, jobs_df, result, {
+                "generated_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+                "sources": {"roster": args.roster, "jobs": args.jobs},
+                "top_k": args.top_k,
+                "weights": DEFAULT_WEIGHTS,
+                "timings": run.totals(),
+            })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Background refresh of loaded data, so no viewer waits on a download.
+
+A ``Refresher`` calls its ``load`` function on a daemon thread: once at
+start, then again every ``interval`` seconds (shortened by up to
+``jitter``), or on an exponential backoff after a failure.  Each success
+replaces the published ``Refreshed`` result in a single reference swap, so
+readers always see one complete result, old or new, and never wait on a
+refresh that is in progress.  Each load runs as an ``instrument.Run``
+named ``refresh-<name>``, whose stages are kept on the result.
+"""
+import logging
+import random
+import threading
+import time
+
+from instrument import Run
+
+log = logging.getLogger(__name__)
+
+# No wait between attempts is shorter than this, whatever the settings
+MIN_DELAY = 1.0
+
+
+class Refreshed:
+    """One published result: the last good value plus the latest attempt's outcome."""
+
+    def __init__(self, value, loaded_at, error=None, failures=0, refreshes=0, seconds=None, stages=()):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.error = error
+        self.failures = failures
+        self.refreshes = refreshes
+        self.seconds = seconds
+        self.stages = list(stages)  # the last good load's stage records (fetch, parse, clean, ...)
+
+    @property
+    def age(self):
+        return time.time() - self.loaded_at
+
+
+class Refresher:
+    """Keeps ``load()``'s result warm on a background thread.
+
+    ``interval`` is the time between successful refreshes; set it a little
+    under the data's TTL so a new result is ready before the old one counts
+    as stale.  After ``n`` consecutive failures the next attempt waits
+    ``backoff * 2 ** (n - 1)`` seconds, capped at ``max_backoff``.  Every
+    delay is scaled by a random factor between ``1 - jitter`` and 1, so
+    processes sharing a source don't refresh in lockstep and a refresh never
+    lands later than ``interval``.  Waits never drop below ``MIN_DELAY``, so
+    a non-positive ``interval`` (a TTL at or under its refresh lead) can't
+    turn into a busy loop.  ``on_refresh(value)`` runs after each success;
+    its errors are logged and otherwise ignored.
+    """
+
+    def __init__(self, name, load, interval, jitter=0.1, backoff=5.0, max_backoff=300.0, on_refresh=None):
+        if interval < MIN_DELAY:
+            log.warning("Refresh interval for %s is %ss; using %ss", name, interval, MIN_DELAY)
+            interval = MIN_DELAY
+        self.name = name
+        self.load = load
+        self.interval = interval
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_refresh = on_refresh
+        self.next_at = None
+        self._result = None
+        self._attempted = threading.Event()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the refresh thread (once); the first load begins immediately."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"refresh-{self.name}", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def latest(self):
+        """The current ``Refreshed`` result, or None before the first attempt finishes."""
+        return self._result
+
+    def wait(self, timeout=None):
+        """``latest()``, waiting up to ``timeout`` seconds for the first attempt."""
+        self._attempted.wait(timeout)
+        return self._result
+
+    def _delay(self, failures):
+        if failures:
+            delay = min(self.max_backoff, self.backoff * 2 ** (failures - 1))
+        else:
+            delay = self.interval
+        return max(MIN_DELAY, delay * random.uniform(1 - self.jitter, 1))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._refresh()
+            delay = self._delay(self._result.failures)
+            self.next_at = time.time() + delay
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _refresh(self):
+        previous = self._result
+        refreshes = previous.refreshes if previous else 0
+        start = time.perf_counter()
+        run = Run(f"refresh-{self.name}")
+        try:
+            with run:
+                value = self.load()
+        except Exception as e:
+            failures = previous.failures + 1 if previous else 1
+            log.warning("Refreshing %s failed (%d in a row)", self.name, failures, exc_info=True)
+            if previous is None:
+                self._result = Refreshed(None, time.time(), e, failures, refreshes)
+            else:
+                self._result = Refreshed(
+                    previous.value, previous.loaded_at, e, failures, refreshes, previous.seconds, previous.stages
+                )
+        else:
+            seconds = time.perf_counter() - start
+            self._result = Refreshed(value, time.time(), refreshes=refreshes + 1, seconds=seconds, stages=run.stages)
+            if self.on_refresh is not None:
+                try:
+                    self.on_refresh(value)
+                except Exception:
+                    log.warning("After-refresh hook for %s failed", self.name, exc_info=True)
+        self._attempted.set()
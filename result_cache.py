@@ -0,0 +1,72 @@
+"""Process-wide cache for results derived from one version of the data.
+
+Every viewer of the same data needs the same cohorts, KPI values, tables
+and top matches.  ``ResultCache`` keeps one copy per ``(name, key)`` for
+the whole server process, where ``key`` starts with the data version, and
+computes each entry once: a session asking for an entry that another
+session is still computing waits for that result instead of computing its
+own.  Hits and misses are counted with ``instrument.record_cache``.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from instrument import record_cache
+
+
+class ResultCache:
+    """Least-recently-used results, computed at most once per key at a time.
+
+    Cached values are shared between sessions and threads, so treat them as
+    read-only.  ``max_entries=0`` keeps nothing once computed, but still
+    shares a computation between the sessions waiting on it.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._pending = {}
+
+    def get(self, name, key, compute):
+        """``compute()``'s result for ``(name, key)``; errors are raised to every waiter, not cached."""
+        full_key = (name, key)
+        with self._lock:
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                value, future = self._entries[full_key], None
+            else:
+                future = self._pending.get(full_key)
+                owner = future is None
+                if owner:
+                    future = self._pending[full_key] = Future()
+        if future is None:
+            record_cache(name, hit=True)
+            return value
+        if not owner:
+            record_cache(name, hit=True)
+            return future.result()
+
+        record_cache(name, hit=False)
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[full_key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[full_key]
+            if self.max_entries:
+                self._entries[full_key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,129 @@
+"""Incremental subscore cache.
+
+Each candidate and job feature row gets a stable 64-bit fingerprint.  After a
+data refresh only the matrix rows of new or changed candidates and the
+columns of new or changed jobs are rescored; every other cell is copied from
+the previous matrices.  Totals are a weighted sum over the cached subscores,
+so changing the weights never rescores anything.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from scoring import CANDIDATE_SUBSCORES, PAIR_SUBSCORES, subscores
+
+
+def row_fingerprints(features):
+    """One uint64 per row, stable across processes and reruns."""
+    return pd.util.hash_pandas_object(features, index=False).to_numpy()
+
+
+def _previous_positions(old_keys, new_keys):
+    """Position of each new key in the old key array, or -1 if it is new."""
+    old = pd.Series(np.arange(len(old_keys)), index=old_keys)
+    old = old[~old.index.duplicated()]
+    return old.reindex(new_keys).fillna(-1).to_numpy(dtype=np.intp)
+
+
+class ScoreStore:
+    """Subscores (see ``scoring.subscores``) keyed on candidate and job fingerprints.
+
+    ``update`` returns the subscores for the given feature tables,
+    recomputing only what changed since the last call; treat the returned
+    arrays as read-only.  ``stats`` holds counters for the last update and
+    running totals.  An update given a data ``version`` also keeps its
+    counters per version (``changes_for``): the first update for a version is
+    the one that brought the store up to that data, and later no-op updates
+    for it don't overwrite them.
+    """
+
+    def __init__(self, max_versions=16):
+        self._lock = threading.Lock()
+        self.cand_keys = np.zeros(0, dtype=np.uint64)
+        self.job_keys = np.zeros(0, dtype=np.uint64)
+        self.subs = None
+        self.stats = {
+            "updates": 0,
+            "rows_recomputed": 0,
+            "cols_recomputed": 0,
+            "cells_recomputed": 0,
+            "cells_reused": 0,
+            "total_cells_recomputed": 0,
+            "total_cells_reused": 0,
+        }
+        self.max_versions = max_versions
+        self._changes = OrderedDict()
+
+    def update(self, cand, jobs, version=None):
+        cand_keys, job_keys = row_fingerprints(cand), row_fingerprints(jobs)
+        with self._lock:
+            subs = self._update(cand, jobs, cand_keys, job_keys)
+            if version is not None and version not in self._changes:
+                self._changes[version] = dict(self.stats)
+                while len(self._changes) > self.max_versions:
+                    self._changes.popitem(last=False)
+            return subs
+
+    def changes_for(self, version):
+        """Counters of the update that first reached data ``version``, or None if none did."""
+        with self._lock:
+            changes = self._changes.get(version)
+        return None if changes is None else dict(changes)
+
+    def _update(self, cand, jobs, cand_keys, job_keys):
+        shape = (len(cand), len(jobs))
+        if (
+            self.subs is not None
+            and np.array_equal(cand_keys, self.cand_keys)
+            and np.array_equal(job_keys, self.job_keys)
+        ):
+            self._record(0, 0, 0, shape[0] * shape[1])
+            return self.subs
+
+        if self.subs is None:
+            subs = subscores(cand, jobs)
+            self._record(shape[0], shape[1], shape[0] * shape[1], 0)
+            self.cand_keys, self.job_keys, self.subs = cand_keys, job_keys, subs
+            return subs
+
+        rows = _previous_positions(self.cand_keys, cand_keys)
+        cols = _previous_positions(self.job_keys, job_keys)
+        old_rows, new_rows = np.flatnonzero(rows >= 0), np.flatnonzero(rows < 0)
+        old_cols, new_cols = np.flatnonzero(cols >= 0), np.flatnonzero(cols < 0)
+
+        subs = {}
+        for name in PAIR_SUBSCORES:
+            prev = self.subs[name]
+            subs[name] = np.empty(shape, dtype=prev.dtype)
+            subs[name][np.ix_(old_rows, old_cols)] = prev[np.ix_(rows[old_rows], cols[old_cols])]
+        for name in CANDIDATE_SUBSCORES:
+            prev = self.subs[name]
+            subs[name] = np.empty(shape[0], dtype=prev.dtype)
+            subs[name][old_rows] = prev[rows[old_rows]]
+
+        if len(new_rows):
+            fresh = subscores(cand.iloc[new_rows], jobs)
+            for name in PAIR_SUBSCORES:
+                subs[name][new_rows, :] = fresh[name]
+            for name in CANDIDATE_SUBSCORES:
+                subs[name][new_rows] = fresh[name]
+        if len(old_rows) and len(new_cols):
+            fresh = subscores(cand.iloc[old_rows], jobs.iloc[new_cols])
+            for name in PAIR_SUBSCORES:
+                subs[name][np.ix_(old_rows, new_cols)] = fresh[name]
+
+        recomputed = len(new_rows) * len(jobs) + len(old_rows) * len(new_cols)
+        self._record(len(new_rows), len(new_cols), recomputed, shape[0] * shape[1] - recomputed)
+        self.cand_keys, self.job_keys, self.subs = cand_keys, job_keys, subs
+        return subs
+
+    def _record(self, rows, cols, recomputed, reused):
+        self.stats["updates"] += 1
+        self.stats["rows_recomputed"] = rows
+        self.stats["cols_recomputed"] = cols
+        self.stats["cells_recomputed"] = recomputed
+        self.stats["cells_reused"] = reused
+        self.stats["total_cells_recomputed"] += recomputed
+        self.stats["total_cells_reused"] += reused
@@ -0,0 +1,376 @@
+"""Vectorized candidate × job match scoring.
+
+Scoring works only on the feature tables built by ``features.py``: every
+subscore is a per-candidate or per-job lookup broadcast over the full
+(candidates × jobs) matrix, so no Python code runs per pair.  The rules are
+the ones described in the "Match Score Algorithm" section of the README.
+"""
+import numpy as np
+import pandas as pd
+
+from features import candidate_features, job_features, job_labels
+from locations import unit_vectors, within_miles
+
+SUBSCORES = ["Vertical", "Salary", "Geo", "Confidence", "Readiness"]
+PAIR_SUBSCORES = ["Vertical", "Salary", "Geo"]
+CANDIDATE_SUBSCORES = ["Confidence", "Readiness"]
+
+# Most points each component can contribute at weight 1.0 (see the README)
+MAX_POINTS = {"Vertical": 40, "Salary": 25, "Geo": 20, "Confidence": 15, "Readiness": 10}
+DEFAULT_WEIGHTS = {name: 1.0 for name in SUBSCORES}
+
+CONFIDENCE_POINTS = {"high": 15, "moderate": 10, "low": 5, "unknown": 10}
+
+# Geographic fit: points by great-circle distance (miles), nearest band first.
+# The same place key scores like the nearest band and the same state at least
+# GEO_SAME_STATE, which covers places the gazetteer has no coordinates for.
+GEO_BANDS = {25: 20, 100: 15, 250: 10}
+GEO_SAME_PLACE = 20
+GEO_SAME_STATE = 10
+GEO_OTHER = 5
+
+# Match result columns: frame positions, not labels, and scores rounded to
+# 0.1 (so float32 holds them exactly enough to print)
+POSITION_DTYPE = np.int32
+RANK_DTYPE = np.int16
+SCORE_DTYPE = np.float32
+
+
+def _shared_codes(left, right):
+    """Integer-code two string columns against one shared vocabulary (-1 for missing)."""
+    codes, _ = pd.factorize(pd.concat([left, right], ignore_index=True))
+    return codes[:len(left)], codes[len(left):]
+
+
+# ---- Encoding ----
+
+def encode_features(cand, jobs):
+    """Plain NumPy arrays for scoring ``cand`` against ``jobs``.
+
+    String features are integer-coded against vocabularies shared by both
+    sides, so equal codes mean equal strings.  Locations become ``place``
+    and ``state`` codes plus a ``position`` (n, 3) unit vector, NaN where
+    the gazetteer has no coordinates.  Candidate arrays are row-aligned with
+    ``cand`` and can be sliced into blocks.
+    """
+    c_vert, j_vert = _shared_codes(cand["vert"], jobs["vert"])
+    c_place, j_place = _shared_codes(cand["loc_key"], jobs["loc_key"])
+    c_state, j_state = _shared_codes(cand["loc_state"], jobs["loc_state"])
+    # A missing place or state must not match a missing one on the other side
+    j_place[j_place < 0] = -2
+    j_state[j_state < 0] = -2
+
+    cand_arrays = {
+        "vert": c_vert,
+        "experience": cand["experience"].to_numpy(dtype=bool),
+        "salary_mid": cand["salary_mid"].to_numpy(dtype=float),
+        "place": c_place,
+        "state": c_state,
+        "position": unit_vectors(cand["lat"], cand["lon"]),
+        "confidence": _confidence_scores(cand),
+        "readiness": _readiness_scores(cand),
+    }
+    job_arrays = {
+        "vert": j_vert,
+        "salary_mid": jobs["salary_mid"].to_numpy(dtype=float),
+        "place": j_place,
+        "state": j_state,
+        "position": unit_vectors(jobs["lat"], jobs["lon"]),
+    }
+    return cand_arrays, job_arrays
+
+
+def slice_rows(arrays, start, stop):
+    """Rows ``start:stop`` of every encoded candidate array."""
+    return {name: values[start:stop] for name, values in arrays.items()}
+
+
+# ---- Subscores ----
+
+def _vertical_scores(c, j):
+    same = c["vert"][:, None] == j["vert"][None, :]
+    bonus = np.where(c["experience"], 10, 0)
+    return np.where(same, 30, 0) + bonus[:, None]
+
+
+def _salary_scores(c, j):
+    c_sal = c["salary_mid"][:, None]
+    j_sal = j["salary_mid"][None, :]
+
+    # NaN midpoints fall through every comparison below and score 0
+    known = (c_sal != 0) & (j_sal != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.select(
+            [j_sal >= 1.05 * c_sal, np.abs(j_sal - c_sal) / c_sal <= 0.05, j_sal < 0.95 * c_sal],
+            [25, 15, -10],
+            default=0,
+        )
+    return np.where(known, score, 0)
+
+
+def _geo_scores(c, j):
+    # Dot products of unit vectors: higher is closer, NaN (no coordinates) is never close
+    closeness = c["position"] @ j["position"].T
+    points = np.full(closeness.shape, GEO_OTHER, dtype=np.int8)
+    for miles in sorted(GEO_BANDS, reverse=True):  # nearer bands overwrite farther ones
+        points[closeness >= within_miles(miles)] = GEO_BANDS[miles]
+    # Missing codes are -1 for candidates and -2 for jobs, so they never match
+    same_state = c["state"][:, None] == j["state"][None, :]
+    points[same_state & (points < GEO_SAME_STATE)] = GEO_SAME_STATE
+    points[c["place"][:, None] == j["place"][None, :]] = GEO_SAME_PLACE
+    return points
+
+
+def _confidence_scores(cand):
+    return cand["confidence"].map(CONFIDENCE_POINTS).to_numpy(dtype=np.int8)
+
+
+def _readiness_scores(cand):
+    week = cand["week"].to_numpy(dtype=float)
+    return np.where(week >= 6, 10.0, np.where((week >= 1) & (week <= 5), week * 1.5, 5.0))
+
+
+def encoded_subscores(c, j):
+    """``subscores`` for arrays from ``encode_features`` (or a row slice of them)."""
+    return {
+        "Vertical": _vertical_scores(c, j).astype(np.int8),
+        "Salary": _salary_scores(c, j).astype(np.int8),
+        "Geo": _geo_scores(c, j).astype(np.int8),
+        "Confidence": c["confidence"],
+        "Readiness": c["readiness"],
+    }
+
+
+def subscores(cand, jobs):
+    """The five unweighted subscores, stored as compactly as they allow.
+
+    ``cand`` and ``jobs`` are the feature tables from ``candidate_features``
+    and ``job_features``.  Names in ``PAIR_SUBSCORES`` map to
+    (n_candidates, n_jobs) int8 matrices; names in ``CANDIDATE_SUBSCORES``
+    depend only on the candidate and map to (n_candidates,) vectors.
+    """
+    return encoded_subscores(*encode_features(cand, jobs))
+
+
+def round_scores(total):
+    """``round(x, 1)`` for every cell, matching Python's rounding exactly.
+
+    Cells right at a .x5 boundary are rounded one by one in Python, so round
+    only the scores being shown, not a whole matrix.
+    """
+    # Totals that are whole or half points are already exact
+    if np.array_equal(total * 2, np.round(total * 2)):
+        return total
+    rounded = np.round(total, 1)
+    # np.round can disagree with round() right at a .x5 boundary; redo those
+    scaled = total * 10
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(v, 1) for v in total[near_half].tolist()]
+    return rounded
+
+
+def weighted_total(subs, weights=None):
+    """Unrounded total score matrix from ``subscores`` output and per-component weights.
+
+    ``weights`` maps subscore names to multipliers (missing names count as
+    1.0), so the default reproduces the README's point scale.  This is only
+    a weighted sum — nothing is re-parsed or re-compared.  Matches are
+    ranked on it; ``round_scores`` gives the displayed one-decimal scores.
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    # Summed in SUBSCORES order, so default weights give bit-identical totals
+    total = np.zeros(subs["Vertical"].shape)
+    for name in PAIR_SUBSCORES:
+        total += weights[name] * subs[name]
+    for name in CANDIDATE_SUBSCORES:
+        total += weights[name] * subs[name][:, None]
+    return total
+
+
+def score_matrix(cand, jobs, weights=None):
+    """Score every candidate against every job.
+
+    Returns a dict with one (n_candidates, n_jobs) array per name in
+    ``SUBSCORES`` plus ``"Total"``, the rounded weighted sum shown on the
+    dashboard.  See ``subscores`` for the compact form.
+    """
+    subs = subscores(cand, jobs)
+    shape = (len(cand), len(jobs))
+    scores = {name: subs[name] for name in PAIR_SUBSCORES}
+    for name in CANDIDATE_SUBSCORES:
+        scores[name] = np.broadcast_to(subs[name][:, None], shape)
+    scores["Total"] = round_scores(weighted_total(subs, weights))
+    return scores
+
+
+def top_k_indices(total, k):
+    """Column positions of the ``k`` best cells in each row, best first.
+
+    Uses ``np.partition`` to find each row's k-th best score, so the cost is
+    linear in the number of columns.  Ties go to the lower column position.
+    """
+    n_rows, n_cols = total.shape
+    k = min(k, n_cols)
+    if k == 0:
+        return np.zeros((n_rows, 0), dtype=np.intp)
+
+    kth = np.partition(total, n_cols - k, axis=1)[:, n_cols - k][:, None]
+    above = total > kth
+    # Fill the remaining slots with cells equal to the k-th score, left to right
+    ties = total == kth
+    room = k - above.sum(axis=1, keepdims=True)
+    keep = above | (ties & (np.cumsum(ties, axis=1) <= room))
+
+    idx = np.nonzero(keep)[1].reshape(n_rows, k)
+    order = np.argsort(-np.take_along_axis(total, idx, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def top_k_frame(total, k, offset=0):
+    """Top-``k`` rows for a block of the score matrix.
+
+    Returns one row per kept match with ``candidate`` (row position plus
+    ``offset``) and ``job`` positions, ``rank`` (1 = best) and the rounded
+    ``Total Score``, candidate-major.  Labels are left out; join them onto
+    the rows being shown with ``pipeline.label_matches``.
+    """
+    n_rows = total.shape[0]
+    idx = top_k_indices(total, k)
+    k = idx.shape[1]
+    return pd.DataFrame({
+        "candidate": np.repeat(np.arange(offset, offset + n_rows, dtype=POSITION_DTYPE), k),
+        "job": idx.ravel().astype(POSITION_DTYPE),
+        "rank": np.tile(np.arange(1, k + 1, dtype=RANK_DTYPE), n_rows),
+        "Total Score": round_scores(np.take_along_axis(total, idx, axis=1).ravel()).astype(SCORE_DTYPE),
+    })
+
+
+def top_candidates_frame(total, k, offset=0):
+    """Top-``k`` candidates for every job, read column-wise from ``total``.
+
+    The job-centric mirror of ``top_k_frame``: one row per kept match with
+    ``job`` (column position plus ``offset``) and ``candidate`` positions,
+    ``rank`` (1 = best candidate for that job) and ``Total Score``,
+    job-major.  Ties go to the lower candidate position.  It partitions the
+    same matrix along the other axis, so nothing is rescored.
+    """
+    n_cols = total.shape[1]
+    idx = top_k_indices(total.T, k)
+    k = idx.shape[1]
+    return pd.DataFrame({
+        "job": np.repeat(np.arange(offset, offset + n_cols, dtype=POSITION_DTYPE), k),
+        "candidate": idx.ravel().astype(POSITION_DTYPE),
+        "rank": np.tile(np.arange(1, k + 1, dtype=RANK_DTYPE), n_cols),
+        "Total Score": round_scores(np.take_along_axis(total.T, idx, axis=1).ravel()).astype(SCORE_DTYPE),
+    })
+
+
+def block_rows(n_jobs, block_cells):
+    """Candidates per block so a block's matrix has about ``block_cells`` cells."""
+    return max(1, block_cells // max(n_jobs, 1))
+
+
+def score_block(c, j, k, weights=None, offset=0):
+    """``top_k_frame`` for one block of encoded candidates against every job."""
+    return top_k_frame(weighted_total(encoded_subscores(c, j), weights), k, offset=offset)
+
+
+def top_matches(cand, jobs, k=3, weights=None, block_cells=1_000_000):
+    """Best ``k`` jobs for every candidate, without building the full table.
+
+    Candidates are scored in blocks of about ``block_cells`` matrix cells and
+    only each block's top ``k`` survive, so memory stays bounded by the block
+    size rather than candidates × jobs.  See ``top_k_frame`` for the columns,
+    and ``parallel.top_matches_parallel`` for the multi-process version.
+    """
+    c, j = encode_features(cand, jobs)
+    block = block_rows(len(jobs), block_cells)
+    frames = [
+        score_block(slice_rows(c, start, start + block), j, k, weights, offset=start)
+        for start in range(0, len(cand), block)
+    ]
+    if not frames:
+        return top_k_frame(np.zeros((0, len(jobs))), k)
+    return pd.concat(frames, ignore_index=True)
+
+
+def slice_subscores(subs, start, stop, axis=0):
+    """``subscores`` output for candidates (``axis=0``) or jobs (``axis=1``) ``start:stop``."""
+    rows = slice(start, stop) if axis == 0 else slice(None)
+    cols = slice(start, stop) if axis == 1 else slice(None)
+    sliced = {name: subs[name][rows, cols] for name in PAIR_SUBSCORES}
+    sliced.update({name: subs[name][rows] for name in CANDIDATE_SUBSCORES})
+    return sliced
+
+
+def top_k_from_subscores(subs, k, weights=None, block_cells=1_000_000):
+    """``top_k_frame`` of ``weighted_total(subs, weights)``, a block of candidates at a time.
+
+    Only one block's float totals exist at once, so re-ranking stored
+    subscores under new weights costs about ``block_cells`` cells of memory
+    rather than a full candidates × jobs matrix.
+    """
+    n_cand, n_jobs = subs["Vertical"].shape
+    block = block_rows(n_jobs, block_cells)
+    frames = [
+        top_k_frame(weighted_total(slice_subscores(subs, start, start + block), weights), k, offset=start)
+        for start in range(0, n_cand, block)
+    ]
+    if not frames:
+        return top_k_frame(np.zeros((0, n_jobs)), k)
+    return pd.concat(frames, ignore_index=True)
+
+
+def top_candidates_from_subscores(subs, k, weights=None, block_cells=1_000_000):
+    """``top_candidates_frame`` of ``weighted_total(subs, weights)``, a block of jobs at a time."""
+    n_cand, n_jobs = subs["Vertical"].shape
+    block = block_rows(n_cand, block_cells)
+    frames = [
+        top_candidates_frame(
+            weighted_total(slice_subscores(subs, start, start + block, axis=1), weights), k, offset=start
+        )
+        for start in range(0, n_jobs, block)
+    ]
+    if not frames:
+        return top_candidates_frame(np.zeros((n_cand, 0)), k)
+    return pd.concat(frames, ignore_index=True)
+
+
+def match_pairs(candidates_df, jobs_df, cand=None, jobs=None, weights=None):
+    """Long-format match table, one row per (candidate, job) pair.
+
+    This materializes the full cross product and is only meant for explicit
+    exports; the dashboard itself renders from the top-k selection.  Rows are
+    candidate-major in frame order.  Text columns are categoricals, so each
+    distinct label is stored once however many pairs repeat it.  Pass
+    precomputed feature tables as ``cand``/``jobs`` to skip feature
+    extraction.
+    """
+    if cand is None:
+        cand = candidate_features(candidates_df)
+    if jobs is None:
+        jobs = job_features(jobs_df)
+    total = round_scores(weighted_total(subscores(cand, jobs), weights))
+    n_c, n_j = len(candidates_df), len(jobs_df)
+    labels = job_labels(jobs_df)
+    cand_rows = np.repeat(np.arange(n_c), n_j)
+    job_rows = np.tile(np.arange(n_j), n_c)
+
+    def per_candidate(values):
+        return pd.Categorical(values).take(cand_rows)
+
+    def per_job(col):
+        return pd.Categorical(labels[col]).take(job_rows)
+
+    return pd.DataFrame({
+        "Candidate": per_candidate(candidates_df["MIT Name"]),
+        "Job Account": per_job("Job Account"),
+        "Title": per_job("Title"),
+        "City": per_job("City"),
+        "State": per_job("State"),
+        "VERT": per_job("VERT"),
+        "Total Score": total.ravel().astype(SCORE_DTYPE),
+        "Week": candidates_df["Week"].array.take(cand_rows),
+        "Status": per_candidate(candidates_df["Status"]),
+    })
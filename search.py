@@ -0,0 +1,91 @@
+"""Prefix search over the roster and jobs, from an index built once per data load.
+
+Every searchable cell is split into lower-case word tokens.  A
+``SearchIndex`` keeps the sorted token vocabulary and, for each token, the
+sorted row positions that contain it (one concatenated postings array with
+offsets).  A query term matches every token it is a prefix of, which is a
+contiguous range of the sorted vocabulary found by binary search, so a
+lookup never scans the frame's strings.  Terms are ANDed: "sea amz" finds
+rows with a word starting "sea" and a word starting "amz".
+
+State abbreviations also index their full name, so "texas" finds "TX".
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from locations import US_STATES
+
+ROSTER_SEARCH_FIELDS = ["MIT Name", "Training Site", "Location", "VERT"]
+JOBS_SEARCH_FIELDS = ["Title", "Job Title", "Account", "Job Account", "City", "State", "VERT", "Vertical"]
+PLACE_FIELDS = {"Location", "City", "State"}
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower())
+
+
+def _place_tokens(text):
+    """Tokens of a place, plus the full name of any state abbreviation in it."""
+    tokens = tokenize(text)
+    names = [US_STATES[t.upper()] for t in tokens if len(t) == 2 and t.upper() in US_STATES]
+    return tokens + [t for name in names for t in tokenize(name)]
+
+
+class SearchIndex:
+    """Token -> row positions for the ``fields`` of ``frame`` that it has."""
+
+    def __init__(self, frame, fields):
+        self.size = len(frame)
+        token_parts, row_parts = [], []
+        for field in [f for f in fields if f in frame.columns]:
+            split = _place_tokens if field in PLACE_FIELDS else tokenize
+            codes, values = pd.factorize(frame[field])
+            # Rows grouped by value, so each distinct value is tokenized once
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            for code, value in enumerate(values):
+                rows = order[bounds[code]:bounds[code + 1]]
+                for token in set(split(value)):
+                    token_parts.append(np.full(len(rows), token, dtype=object))
+                    row_parts.append(rows)
+
+        if token_parts:
+            tokens = np.concatenate(token_parts)
+            rows = np.concatenate(row_parts)
+        else:
+            tokens, rows = np.zeros(0, dtype=object), np.zeros(0, dtype=np.intp)
+        token_ids, vocabulary = pd.factorize(tokens, sort=True)
+        pairs = np.unique(np.column_stack([token_ids, rows]).astype(np.int64), axis=0)
+        self.vocabulary = np.asarray(vocabulary, dtype=str)
+        self.postings = pairs[:, 1].astype(np.int32)
+        self.offsets = np.searchsorted(pairs[:, 0], np.arange(len(self.vocabulary) + 1))
+
+    def lookup(self, prefix):
+        """Sorted row positions with a token starting with ``prefix``."""
+        lo = np.searchsorted(self.vocabulary, prefix, side="left")
+        hi = np.searchsorted(self.vocabulary, prefix + "\uffff", side="left")
+        return np.unique(self.postings[self.offsets[lo]:self.offsets[hi]])
+
+    def search(self, query):
+        """Row positions matching every term of ``query``, or None for an empty query."""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        hits = self.lookup(terms[0])
+        for term in terms[1:]:
+            if not len(hits):
+                break
+            hits = np.intersect1d(hits, self.lookup(term), assume_unique=True)
+        return hits
+
+
+def build_indexes(df, jobs_df):
+    """Search indexes for the roster and the jobs of one data load."""
+    return {
+        "roster": SearchIndex(df, ROSTER_SEARCH_FIELDS),
+        "jobs": SearchIndex(jobs_df, JOBS_SEARCH_FIELDS),
+    }
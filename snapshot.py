@@ -0,0 +1,88 @@
+"""Last-known-good snapshots of the cleaned roster and jobs frames.
+
+Each successful load is written to an uncompressed Arrow IPC (Feather v2)
+file, which is read back through a memory map.  The app serves a snapshot
+immediately on a cold start or when Google Sheets is unreachable, until
+its background refresher (``refresher.py``) has a newer load.
+"""
+import logging
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR", ".snapshots")
+
+
+class Snapshot:
+    def __init__(self, df, saved_at):
+        self.df = df
+        self.saved_at = saved_at
+
+
+def _path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.arrow")
+
+
+def arrow_safe(df):
+    """Stringify object columns that mix types, which Arrow can't store as-is."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def save_snapshot(name, df):
+    """Atomically replace the ``name`` snapshot with ``df``.
+
+    Snapshots are best-effort: a failed write is logged, never raised.
+    """
+    path = _path(name)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        table = pa.Table.from_pandas(arrow_safe(df), preserve_index=False)
+        feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, path)
+    except (OSError, pa.ArrowException):
+        log.warning("Could not save %s snapshot", name, exc_info=True)
+
+
+def touch_snapshot(name):
+    """Mark the ``name`` snapshot as saved now, for a load that matched it.
+
+    Its age is read from the file's mtime, so an unchanged download must
+    still move that forward.  Best-effort, like ``save_snapshot``.
+    """
+    try:
+        os.utime(_path(name))
+    except OSError:
+        log.warning("Could not touch %s snapshot", name, exc_info=True)
+
+
+def load_snapshot(name):
+    """The saved ``name`` snapshot, or None if there is none (or it's unreadable)."""
+    path = _path(name)
+    try:
+        saved_at = os.path.getmtime(path)
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return Snapshot(table.to_pandas(), saved_at)
+
+
+def format_age(seconds):
+    if seconds < 90:
+        return f"{int(seconds)}s"
+    if seconds < 90 * 60:
+        return f"{int(seconds // 60)} min"
+    if seconds < 36 * 3600:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 86400:.1f} days"
+
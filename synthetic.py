@@ -0,0 +1,144 @@
+"""Synthetic Active Roster and Placement Options sheets for benchmarks.
+
+The CSVs have the same shape as the published Google Sheets: a title row
+above the roster header, five preamble rows above the jobs header, the
+trailing-space ``"Week "`` column, ``"Start date"``, and salaries written
+the way people type them ("$65,000.00", "70k-75k", "$70,000 – $75,000").
+Generation is seeded, so the same size, seed and ``today`` always give the
+same rows::
+
+    python synthetic.py --candidates 2000 --jobs 2000 --out data/
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+VERTICALS = ["AMZ", "AVI", "RME", "HC", "EDU", "MFG"]
+PLACES = [
+    ("Seattle", "WA"), ("Tacoma", "WA"), ("Dallas", "TX"), ("Austin", "TX"), ("Houston", "TX"),
+    ("Chicago", "IL"), ("Atlanta", "GA"), ("Phoenix", "AZ"), ("Denver", "CO"), ("Miami", "FL"),
+    ("Orlando", "FL"), ("Nashville", "TN"), ("Columbus", "OH"), ("Charlotte", "NC"), ("Newark", "NJ"),
+]
+TRAINING_SITES = ["Seattle", "Dallas", "Chicago", "Atlanta", "Remote"]
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Garcia", "Smith", "Nguyen", "Johnson", "Patel", "Brown", "Lee", "Lopez", "Kim", "Davis"]
+
+# Raw statuses as typed in the sheet, with rough frequencies
+STATUSES = {
+    "Training": 0.35, "training ": 0.05, "Unassigned": 0.15, "Free Agent Discussing Opportunity": 0.1,
+    "Offer Pending": 0.1, "Offer Accepted": 0.1, "Position Identified": 0.1, "Resigned": 0.05,
+}
+CONFIDENCE = {"High": 0.3, "Moderate": 0.35, "Low": 0.15, "": 0.2}
+EXPERIENCE = {"": 0.5, "Amazon ops, 3 yrs": 0.15, "Aviation maintenance": 0.1, "Retail management": 0.25}
+
+
+def _choice(rng, options, n):
+    """``n`` draws from a list, or from a dict of option -> weight."""
+    if isinstance(options, dict):
+        weights = np.array(list(options.values()))
+        return rng.choice(list(options), size=n, p=weights / weights.sum())
+    return rng.choice(options, size=n)
+
+
+def _salary_text(rng, n, low=55_000, high=95_000, ranges=0.0):
+    """Salary strings in the mix of formats found in the sheets, with blanks."""
+    base = rng.integers(low // 1000, high // 1000, size=n) * 1000
+    top = base + rng.integers(1, 4, size=n) * 5000
+    style = rng.integers(0, 4, size=n)
+    single = np.where(style % 2 == 0, [f"${v:,.2f}" for v in base], [str(v) for v in base])
+    spread = np.where(
+        style < 2,
+        [f"${a:,} – ${b:,}" for a, b in zip(base, top)],
+        [f"{a // 1000}k-{b // 1000}k" for a, b in zip(base, top)],
+    )
+    text = np.where(rng.random(n) < ranges, spread, single)
+    return np.where(rng.random(n) < 0.08, "", text)
+
+
+def roster_frame(n, seed=0, today=None):
+    """Raw Active Roster rows, columns named as in the sheet."""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize() if today is None else pd.Timestamp(today)
+    places = rng.integers(0, len(PLACES), size=n)
+    city = np.array([p[0] for p in PLACES])[places]
+    state = np.array([p[1] for p in PLACES])[places]
+    location = np.where(rng.random(n) < 0.7, np.char.add(np.char.add(city, ", "), state), city)
+    start = today - pd.to_timedelta(rng.integers(-7, 100, size=n), unit="D")
+    manual_week = rng.integers(1, 20, size=n).astype(str)
+
+    return pd.DataFrame({
+        "MIT Name": [
+            f"{first} {last} {i}"
+            for i, (first, last) in enumerate(zip(_choice(rng, FIRST_NAMES, n), _choice(rng, LAST_NAMES, n)))
+        ],
+        "Training Site": _choice(rng, TRAINING_SITES, n),
+        "Location": np.where(rng.random(n) < 0.05, "", location),
+        "Week ": np.where(rng.random(n) < 0.15, manual_week, ""),
+        "Start date": np.where(rng.random(n) < 0.03, "", start.strftime("%m/%d/%Y")),
+        "Salary": _salary_text(rng, n),
+        "Level": _choice(rng, ["L4", "L5", "L6"], n),
+        "Status": _choice(rng, STATUSES, n),
+        "VERT": _choice(rng, VERTICALS, n),
+        "Confidence": _choice(rng, CONFIDENCE, n),
+        "Prior Experience": _choice(rng, EXPERIENCE, n),
+        # Tracked in the sheet but never read by the dashboard
+        "Email": [f"mit{i}@example.com" for i in range(n)],
+        "Mentor": _choice(rng, FIRST_NAMES, n),
+        "Last Check-in": (start + pd.to_timedelta(rng.integers(0, 30, size=n), unit="D")).strftime("%m/%d/%Y"),
+    })
+
+
+def jobs_frame(n, seed=1):
+    """Raw Placement Options rows, columns named as in the sheet."""
+    rng = np.random.default_rng(seed)
+    places = rng.integers(0, len(PLACES), size=n)
+    return pd.DataFrame({
+        "": "",
+        "Job Title": [f"Operations Manager {i}" for i in range(n)],
+        "Account": _choice(rng, ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne"], n),
+        "City": np.array([p[0] for p in PLACES])[places],
+        "State": np.array([p[1] for p in PLACES])[places],
+        "VERT": _choice(rng, VERTICALS, n),
+        "Salary": _salary_text(rng, n, 60_000, 110_000, ranges=0.6),
+        "JV Link": [f"https://jobs.example.com/{i}" for i in range(n)],
+        "JV ID": np.arange(n).astype(str),
+        "Hiring Manager": _choice(rng, LAST_NAMES, n),
+        "Posted": _choice(rng, ["01/06/2025", "12/02/2024", "11/18/2024"], n),
+    })
+
+
+def roster_csv(n, seed=0, today=None):
+    return "Active Roster\n" + roster_frame(n, seed, today).to_csv(index=False)
+
+
+def jobs_csv(n, seed=1):
+    return "Placement Options\n\n\n\n\n" + jobs_frame(n, seed).to_csv(index=False)
+
+
+def write_sheets(out_dir, candidates, jobs, seed=0, today=None):
+    """Write ``roster.csv`` and ``jobs.csv`` to ``out_dir``; returns both paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    roster_path = os.path.join(out_dir, "roster.csv")
+    jobs_path = os.path.join(out_dir, "jobs.csv")
+    with open(roster_path, "w", encoding="utf-8", newline="") as f:
+        f.write(roster_csv(candidates, seed, today))
+    with open(jobs_path, "w", encoding="utf-8", newline="") as f:
+        f.write(jobs_csv(jobs, seed + 1))
+    return roster_path, jobs_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic roster and jobs CSVs.")
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=".")
+    args = parser.parse_args(argv)
+    for path in write_sheets(args.out, args.candidates, args.jobs, args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
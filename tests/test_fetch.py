@@ -0,0 +1,92 @@
+import itertools
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from fetch import SheetFetcher
+from loadtest import serve_directory
+
+
+@pytest.fixture
+def sheets(tmp_path):
+    """A local server for ``tmp_path``: yields ``(write(name, text), url(name))``."""
+    server, base = serve_directory(str(tmp_path))
+    # Last-Modified has whole seconds, so each write must land in a later one
+    mtimes = itertools.count(time.time(), 10)
+
+    def write(name, text):
+        path = tmp_path / name
+        path.write_text(text)
+        mtime = next(mtimes)
+        os.utime(path, (mtime, mtime))
+
+    yield write, lambda name: f"{base}/{name}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_fetches(sheets):
+    write, url = sheets
+    write("jobs.csv", "Job Title,City\nLead,Dallas\n")
+    fetcher = SheetFetcher()
+
+    first = fetcher.fetch(url("jobs.csv"))
+    assert first.changed and first.requests == 1 and first.not_modified == 0
+
+    repeat = fetcher.fetch(url("jobs.csv"))
+    assert not repeat.changed and repeat.not_modified == 1
+
+    write("jobs.csv", "Job Title,City\nLead,Houston\n")
+    rewritten = fetcher.fetch(url("jobs.csv"))
+    assert rewritten.changed and rewritten.not_modified == 1 and rewritten.requests == 3
+
+
+def test_same_body_is_unchanged_and_not_reparsed(sheets, monkeypatch):
+    write, url = sheets
+    write("jobs.csv", "Job Title,City\nLead,Dallas\n")
+    fetcher = SheetFetcher()
+    parses = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *args, **kwargs: parses.append(1) or read_csv(*args, **kwargs))
+
+    first = fetcher.read_csv(url("jobs.csv"))
+    write("jobs.csv", "Job Title,City\nLead,Dallas\n")  # newer Last-Modified, same bytes
+    again = fetcher.read_csv(url("jobs.csv"))
+
+    sheet = fetcher.fetch(url("jobs.csv"), max_age=60)
+    assert not sheet.changed and sheet.not_modified == 0 and sheet.requests == 2
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(again, first)
+    # Callers get a copy, never the cached frame itself
+    again.loc[0, "City"] = "Austin"
+    assert fetcher.read_csv(url("jobs.csv"), max_age=60).loc[0, "City"] == "Dallas"
+
+
+def test_concurrent_fetches_join_the_download_in_flight(sheets):
+    write, url = sheets
+    write("roster.csv", "MIT Name\nA\n")
+    release = threading.Event()
+
+    class SlowSession(requests.Session):
+        def get(self, *args, **kwargs):
+            release.wait(5)
+            return super().get(*args, **kwargs)
+
+    fetcher = SheetFetcher(session=SlowSession())
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(fetcher.fetch(url("roster.csv")))) for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(results) == 3 and all(sheet is results[0] for sheet in results)
+    assert results[0].requests == 1
@@ -0,0 +1,94 @@
+import sqlite3
+
+import pandas as pd
+
+from cohorts import IN_TRAINING, OFFER_ACCEPTED, READY
+from history import History
+
+MONDAY = pd.Timestamp("2026-09-07 12:00", tz="UTC").timestamp()
+NEXT_WEDNESDAY = MONDAY + 9 * 86400
+
+
+def roster(rows):
+    df = pd.DataFrame(rows, columns=["MIT Name", "Status", "Location", "Start Date"])
+    return df.assign(**{"Start Date": pd.to_datetime(df["Start Date"])})
+
+
+def jobs(rows):
+    return pd.DataFrame(rows, columns=["Job Title", "Account", "City", "State"])
+
+
+def test_record_appends_only_changes(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    history = History(path)
+
+    first = roster([
+        ("A", "Training", "Dallas, TX", "2026-09-01"),
+        ("B", "Unassigned", "Houston", None),
+        ("C", "Training", None, None),
+    ])
+    counts = history.record(
+        first, pd.Series([IN_TRAINING, READY, IN_TRAINING]),
+        jobs([("Lead", "Acme", "Dallas", "TX")] * 2 + [("Tech", "Beta", "Austin", "TX")]),
+        {"Total": 3, "Ready": 1}, at=MONDAY,
+    )
+    assert counts == {"roster": 9, "jobs": 2, "kpis": 2}
+
+    # A is placed and their location cleared, B leaves, D joins; one Lead
+    # opening is filled, Tech closes and Mgr opens; Total doesn't move
+    second = roster([
+        ("A", "Offer Accepted", None, "2026-09-01"),
+        ("C", "Training", None, None),
+        ("D", "Training", None, None),
+    ])
+    second_jobs = jobs([("Lead", "Acme", "Dallas", "TX"), ("Mgr", "Acme", "Plano", "TX")])
+    second_cohort = pd.Series([OFFER_ACCEPTED, IN_TRAINING, IN_TRAINING])
+    counts = history.record(second, second_cohort, second_jobs, {"Total": 3, "Ready": 0}, at=NEXT_WEDNESDAY)
+    assert counts == {"roster": 8, "jobs": 3, "kpis": 1}
+    assert history.writes == 2
+
+    # The same data again appends nothing
+    counts = history.record(second, second_cohort, second_jobs, {"Total": 3, "Ready": 0}, at=NEXT_WEDNESDAY + 60)
+    assert counts == {"roster": 0, "jobs": 0, "kpis": 0}
+    assert history.writes == 2
+
+    with sqlite3.connect(path) as conn:
+        events = conn.execute(
+            "SELECT name, field, value FROM roster_events WHERE at = ? ORDER BY name, field", (NEXT_WEDNESDAY,)
+        ).fetchall()
+        job_events = conn.execute(
+            "SELECT job, change FROM job_events WHERE at = ? ORDER BY job", (NEXT_WEDNESDAY,)
+        ).fetchall()
+        state_names = {name for (name,) in conn.execute("SELECT DISTINCT name FROM roster_state")}
+    assert events == [
+        ("A", "Cohort", OFFER_ACCEPTED), ("A", "Location", None), ("A", "Status", "Offer Accepted"),
+        ("B", "Cohort", None), ("B", "Location", None), ("B", "Status", None),
+        ("D", "Cohort", IN_TRAINING), ("D", "Status", "Training"),
+    ]
+    assert job_events == [
+        ("Lead | Acme | Dallas | TX", -1), ("Mgr | Acme | Plano | TX", 1), ("Tech | Beta | Austin | TX", -1),
+    ]
+    assert state_names == {"A", "C", "D"}
+
+
+def test_trends(tmp_path):
+    history = History(str(tmp_path / "history.sqlite"))
+    job = jobs([("Lead", "Acme", "Dallas", "TX")])
+    history.record(
+        roster([("A", "Training", None, "2026-09-01")]), pd.Series([IN_TRAINING]), job,
+        {"Total": 1, "Ready": 1}, at=MONDAY,
+    )
+    history.record(
+        roster([("A", "Offer Accepted", None, "2026-09-01")]), pd.Series([OFFER_ACCEPTED]), job,
+        {"Total": 1, "Ready": 0}, at=NEXT_WEDNESDAY,
+    )
+
+    trend = history.kpi_trend()
+    assert trend.index.tolist() == [pd.Timestamp("2026-09-07"), pd.Timestamp("2026-09-14")]
+    assert trend["Total"].tolist() == [1, 1]
+    assert trend["Ready"].tolist() == [1, 0]
+
+    placements = history.time_to_placement()
+    assert placements.index.tolist() == [pd.Timestamp("2026-09-14")]
+    assert placements["placements"].tolist() == [1]
+    assert placements["median days"].tolist() == [15.5]
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from cohorts import IN_TRAINING, READY, assign_cohorts
+from ingest import clean_roster
+from pipeline import load_jobs
+
+
+def test_manual_weeks_keep_their_fraction():
+    raw = pd.DataFrame({
+        "MIT Name": ["A", "B", "C", "D"],
+        "Week ": ["6.5", "6", "", "3"],
+        "Start date": ["", "", "2026-09-01", ""],
+        "Status": ["Unassigned", "Training", "Training", "Training"],
+    })
+    df = clean_roster(raw, today="2026-09-10")
+
+    assert df["Week"].tolist() == [6.5, 6.0, 2.0, 3.0]
+    assert assign_cohorts(df).tolist() == [READY, IN_TRAINING, IN_TRAINING, IN_TRAINING]
+
+
+def test_jobs_keep_every_sheet_column(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text(
+        "Placement Options\n\n\n\n\n"
+        "Job Title,Account,City,State,Salary,Hiring Manager,JV Link,JV ID,\n"
+        "Site Lead,Acme,Dallas,TX,$70k,Pat,http://x,7,\n"
+    )
+    jobs = load_jobs(str(path))
+
+    assert list(jobs.columns[:6]) == ["Job Title", "Account", "City", "State", "Salary", "Hiring Manager"]
+    assert "JV Link" not in jobs.columns and "JV ID" not in jobs.columns
+    assert not jobs.columns.str.startswith("Unnamed").any()
+    assert jobs["State"].dtype == "category"
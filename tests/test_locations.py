@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import candidate_features, job_features
+from locations import default_index
+from scoring import GEO_SAME_PLACE, score_matrix
+
+
+@pytest.mark.parametrize("text, key, state", [
+    ("New York", "new york, ny", "NY"),
+    ("Washington", "washington, dc", "DC"),
+    ("new york, nan", "new york, ny", "NY"),
+    ("Tacoma WA", "tacoma, wa", "WA"),
+    ("Dallas, Texas", "dallas, tx", "TX"),
+    ("Texas", None, "TX"),
+    ("NY", None, "NY"),
+])
+def test_lookup(text, key, state):
+    found_key, found_state, lat, lon = default_index().lookup(text)
+
+    assert (found_key, found_state) == (key, state)
+    assert np.isnan(lat) == (key is None)
+
+
+def test_city_named_like_a_state_is_the_same_place():
+    candidates = pd.DataFrame({"MIT Name": ["A", "B"], "Location": ["New York", "Washington"]})
+    jobs = pd.DataFrame({
+        "Title": ["NYC", "DC", "NYC, no state"],
+        "City": ["New York", "Washington", "New York"],
+        "State": ["NY", "DC", ""],
+    })
+    geo = score_matrix(candidate_features(candidates), job_features(jobs))["Geo"]
+
+    assert geo[0, 0] == geo[0, 2] == geo[1, 1] == GEO_SAME_PLACE
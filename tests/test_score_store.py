@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from features import candidate_features, job_features
+from score_store import ScoreStore
+from scoring import SUBSCORES, subscores
+from test_scoring_parity import random_frames
+
+
+def assert_same_subscores(actual, expected):
+    for name in SUBSCORES:
+        np.testing.assert_array_equal(actual[name], expected[name], err_msg=name)
+
+
+def edited_frames(candidates, jobs):
+    """Rows dropped, changed, added, duplicated and reordered; 2 new candidates and 2 new jobs."""
+    candidates = candidates.drop(index=[0, 1])
+    candidates.loc[5, "Salary"] = "$123,456"
+    added = candidates.loc[[7]].assign(**{"MIT Name": "Candidate new", "Week": 3.25})
+    candidates = pd.concat([candidates.iloc[::-1], added, candidates.loc[[3, 3]]], ignore_index=True)
+
+    jobs = jobs.drop(index=[0])
+    jobs.loc[4, "Salary"] = "$321,000"
+    added = jobs.loc[[2]].assign(Title="Job new", Salary="$222,222")
+    jobs = pd.concat([added, jobs.iloc[::-1]], ignore_index=True)
+    return candidates, jobs
+
+
+def test_incremental_update_matches_full_scoring():
+    candidates, jobs = random_frames(3)
+    store = ScoreStore()
+    store.update(candidate_features(candidates), job_features(jobs))
+
+    candidates, jobs = edited_frames(candidates, jobs)
+    cand, job = candidate_features(candidates), job_features(jobs)
+    assert_same_subscores(store.update(cand, job), subscores(cand, job))
+
+    n_cand, n_jobs = len(candidates), len(jobs)
+    assert store.stats["rows_recomputed"] == 2
+    assert store.stats["cols_recomputed"] == 2
+    assert store.stats["cells_recomputed"] == 2 * n_jobs + (n_cand - 2) * 2
+    assert store.stats["cells_reused"] == n_cand * n_jobs - store.stats["cells_recomputed"]
+
+    # Nothing changed: every cell is reused
+    assert_same_subscores(store.update(cand, job, version="v2"), subscores(cand, job))
+    assert store.stats["cells_recomputed"] == 0
+    assert store.changes_for("v2")["cells_reused"] == n_cand * n_jobs
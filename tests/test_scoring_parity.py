@@ -0,0 +1,201 @@
+"""Parity of the vectorized scorer with the original per-pair loop.
+
+``reference_scores`` is the nested ``iterrows`` loop the dashboard used
+before ``scoring.py``, with its salary parsing.  Its geographic block
+follows the distance bands that replaced string comparison (see the README),
+computed per pair with the haversine formula; every other rule is the
+original code unchanged.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import candidate_features, job_features
+from locations import EARTH_RADIUS_MILES, default_index
+from scoring import GEO_BANDS, GEO_OTHER, GEO_SAME_PLACE, GEO_SAME_STATE, SUBSCORES, score_matrix
+
+PLACES = [
+    ("Seattle", "WA"), ("Tacoma", "WA"), ("Dallas", "TX"), ("Fort Worth", "TX"),
+    ("Houston", "TX"), ("Chicago", "IL"), ("Denver", "CO"), ("Smallville", "KS"),
+]
+SALARIES = ["$65,000", "$70,000 – $75,000", "70k-75k", "65000", "$68,250.00", "TBD", "", None]
+VERTS = ["Aviation", "aviation ", "FACILITIES", "Facilities", "Retail", None]
+CONFIDENCE = ["High", "moderate", "Low", "", None]
+WEEKS = [1, 2, 4.5, 5, 5.5, 6, 6.5, 8, 0, -1, None]
+NOTES = ["Amazon warehouse lead", "ex-aviation mechanic", "retail", "", None]
+
+
+def parse_salary(s):
+    if pd.isna(s):
+        return None
+    if isinstance(s, (int, float)):
+        return float(s)
+    s = str(s).replace("$", "").replace(",", "").replace(".00", "").strip()
+    s = s.lower().replace("k", "000").replace("–", "-").replace("—", "-").replace("_", "-")
+    if "-" in s:
+        try:
+            low, high = s.split("-")
+            return (float(low.strip()), float(high.strip()))
+        except ValueError:
+            return None
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def midpoint(val):
+    if isinstance(val, tuple):
+        return (val[0] + val[1]) / 2
+    return val if isinstance(val, (int, float)) else None
+
+
+def miles_between(a, b):
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(h))
+
+
+def geo_score(cand_loc, job_city, job_state):
+    index = default_index()
+    c_key, c_state, c_lat, c_lon = index.lookup(cand_loc)
+    j_key, j_state, j_lat, j_lon = index.lookup(f"{str(job_city).strip()}, {str(job_state).strip()}")
+    score = GEO_OTHER
+    if not any(math.isnan(v) for v in (c_lat, c_lon, j_lat, j_lon)):
+        miles = miles_between((c_lat, c_lon), (j_lat, j_lon))
+        for limit in sorted(GEO_BANDS):
+            if miles <= limit:
+                score = GEO_BANDS[limit]
+                break
+    if c_state is not None and c_state == j_state:
+        score = max(score, GEO_SAME_STATE)
+    if c_key is not None and c_key == j_key:
+        score = GEO_SAME_PLACE
+    return score
+
+
+def reference_scores(candidates_df, jobs_df):
+    """``{name: (n_candidates, n_jobs) array}`` for every subscore and "Total", one pair at a time."""
+    candidates_df = candidates_df.copy()
+    jobs_df = jobs_df.copy()
+    candidates_df["SalaryMid"] = candidates_df["Salary"].apply(parse_salary).apply(midpoint)
+    jobs_df["SalaryMid"] = jobs_df["Salary"].apply(parse_salary).apply(midpoint)
+
+    names = SUBSCORES + ["Total"]
+    scores = {name: np.zeros((len(candidates_df), len(jobs_df))) for name in names}
+    for ci, (_, c) in enumerate(candidates_df.iterrows()):
+        for ji, (_, j) in enumerate(jobs_df.iterrows()):
+            subscores = {}
+
+            vert_score = 0
+            c_vert = str(c.get("VERT", "")).strip().upper()
+            j_vert = str(j.get("VERT", j.get("Vertical", ""))).strip().upper()
+            if c_vert == j_vert:
+                vert_score += 30
+            exp_str = " ".join(
+                str(c.get(k, "")).lower()
+                for k in c.index if any(x in k.lower() for x in ["experience", "notes", "background"])
+            )
+            if "amazon" in exp_str or "aviation" in exp_str:
+                vert_score += 10
+            subscores["Vertical"] = vert_score
+
+            c_sal, j_sal = c.get("SalaryMid"), j.get("SalaryMid")
+            if j_sal and c_sal:
+                if j_sal >= 1.05 * c_sal:
+                    sal_score = 25
+                elif abs(j_sal - c_sal) / c_sal <= 0.05:
+                    sal_score = 15
+                elif j_sal < 0.95 * c_sal:
+                    sal_score = -10
+                else:
+                    sal_score = 0
+            else:
+                sal_score = 0
+            subscores["Salary"] = sal_score
+
+            subscores["Geo"] = geo_score(c.get("Location", ""), j.get("City", ""), j.get("State", ""))
+
+            conf = str(c.get("Confidence", "")).lower()
+            if "high" in conf:
+                conf_score = 15
+            elif "mod" in conf:
+                conf_score = 10
+            elif "low" in conf:
+                conf_score = 5
+            else:
+                conf_score = 10
+            subscores["Confidence"] = conf_score
+
+            week = c.get("Week")
+            if isinstance(week, (int, float)):
+                if week >= 6:
+                    ready_score = 10
+                elif 1 <= week <= 5:
+                    ready_score = week * 1.5
+                else:
+                    ready_score = 5
+            else:
+                ready_score = 5
+            subscores["Readiness"] = ready_score
+
+            for name, value in subscores.items():
+                scores[name][ci, ji] = value
+            scores["Total"][ci, ji] = round(sum(subscores.values()), 1)
+    return scores
+
+
+def _location(rng):
+    city, state = PLACES[rng.integers(len(PLACES))]
+    variants = [
+        f"{city}, {state}", city.lower(), f"{city.upper()} {state.lower()}",
+        f"{city}, {state.title()}", state, "", None,
+    ]
+    return variants[rng.integers(len(variants))]
+
+
+def random_frames(seed, n_candidates=40, n_jobs=30):
+    rng = np.random.default_rng(seed)
+
+    def pick(values, n):
+        return [values[i] for i in rng.integers(len(values), size=n)]
+
+    candidates = pd.DataFrame({
+        "MIT Name": [f"Candidate {i}" for i in range(n_candidates)],
+        "VERT": pick(VERTS, n_candidates),
+        "Experience Notes": pick(NOTES, n_candidates),
+        "Salary": pick(SALARIES, n_candidates),
+        "Location": [_location(rng) for _ in range(n_candidates)],
+        "Confidence": pick(CONFIDENCE, n_candidates),
+        "Week": np.array(pick(WEEKS, n_candidates), dtype=float),
+    })
+    places = pick(PLACES, n_jobs)
+    jobs = pd.DataFrame({
+        "Title": [f"Job {i}" for i in range(n_jobs)],
+        "VERT": pick(VERTS, n_jobs),
+        "Salary": pick(SALARIES, n_jobs),
+        "City": [rng.choice([city, city.lower(), f" {city} "]) for city, _ in places],
+        # Blank and missing states, and full state names
+        "State": [pick([state, state.lower(), "", None], 1)[0] for _, state in places],
+    })
+    return candidates, jobs
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_score_matrix_matches_reference_loop(seed):
+    candidates, jobs = random_frames(seed)
+    expected = reference_scores(candidates, jobs)
+    actual = score_matrix(candidate_features(candidates), job_features(jobs))
+    for name in SUBSCORES + ["Total"]:
+        np.testing.assert_array_equal(np.asarray(actual[name], dtype=float), expected[name], err_msg=name)
+
+
+def test_score_matrix_matches_reference_loop_with_vertical_column():
+    candidates, jobs = random_frames(99, n_candidates=15, n_jobs=10)
+    jobs = jobs.rename(columns={"VERT": "Vertical"})
+    expected = reference_scores(candidates, jobs)
+    actual = score_matrix(candidate_features(candidates), job_features(jobs))
+    for name in SUBSCORES + ["Total"]:
+        np.testing.assert_array_equal(np.asarray(actual[name], dtype=float), expected[name], err_msg=name)
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from features import candidate_features, job_features
+from parallel import top_matches_parallel
+from scoring import subscores, top_candidates_frame, top_candidates_from_subscores, top_k_frame
+from scoring import top_k_from_subscores, top_matches, weighted_total
+from test_scoring_parity import random_frames
+
+WEIGHTS = [None, {"Vertical": 0.5, "Geo": 1.5, "Readiness": 0.0}]
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+@pytest.mark.parametrize("block_cells", [1, 70, 10_000])
+def test_blocked_top_k_matches_full_matrix(weights, block_cells):
+    candidates, jobs = random_frames(7, n_candidates=23, n_jobs=17)
+    subs = subscores(candidate_features(candidates), job_features(jobs))
+    total = weighted_total(subs, weights)
+
+    assert_frame_equal(top_k_from_subscores(subs, 3, weights, block_cells), top_k_frame(total, 3))
+    assert_frame_equal(
+        top_candidates_from_subscores(subs, 3, weights, block_cells), top_candidates_frame(total, 3)
+    )
+
+
+def test_parallel_top_matches_match_serial():
+    candidates, jobs = random_frames(11, n_candidates=37, n_jobs=19)
+    cand, job = candidate_features(candidates), job_features(jobs)
+    weights = WEIGHTS[1]
+
+    assert_frame_equal(
+        top_matches_parallel(cand, job, 3, weights, workers=2, block_cells=100), top_matches(cand, job, 3, weights)
+    )